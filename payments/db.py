@@ -6,7 +6,7 @@ advanced queries and bulk operations.
 """
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
 from sqlalchemy.pool import QueuePool
 import os
 
@@ -35,6 +35,10 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Thread-local session for request handling; ScopedSessionMiddleware removes
+# it at the end of each request
+ScopedSession = scoped_session(SessionLocal)
+
 
 def get_session() -> Session:
     """Get a new SQLAlchemy session."""
@@ -1,7 +1,9 @@
+import csv
+import io
 import factory
 import numpy as np
-import pandas as pd
 from datetime import timedelta
+from django.db import connection, transaction
 from django.utils import timezone
 from factory.django import DjangoModelFactory
 
@@ -19,6 +21,16 @@ from payments.models import (
     ServiceType,
 )
 
+# Payment count from which generate_bulk_data loads payments with COPY
+# instead of multi-row INSERTs
+COPY_THRESHOLD = 10_000
+
+# Enum values sampled by generate_bulk_data, built once as compact int8 arrays
+PURCHASE_STATUS_VALUES = np.fromiter((e.value for e in PurchaseStatus), dtype=np.int8)
+CURRENCY_VALUES = np.fromiter((e.value for e in Currency), dtype=np.int8)
+PAYMENT_METHOD_VALUES = np.fromiter((e.value for e in PaymentMethod), dtype=np.int8)
+PAYMENT_STATUS_VALUES = np.fromiter((e.value for e in PaymentStatus), dtype=np.int8)
+
 
 class CustomerFactory(DjangoModelFactory):
     class Meta:
@@ -97,60 +109,89 @@ class PaymentWithExistingFactory(DjangoModelFactory):
     )
 
 
+def copy_rows(model, columns):
+    """Stream column values into the model's table with PostgreSQL COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(zip(*columns.values()))
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN WITH CSV",
+            buffer,
+        )
+
+
+def random_past_datetimes(n, max_days=365):
+    """Return n aware datetimes a random whole number of days (1 to max_days - 1)
+    before now, drawing every offset in one call against a single now()."""
+    now = timezone.now()
+    days = np.random.randint(1, max_days, n)
+    return [now - timedelta(days=d) for d in days.tolist()]
+
+
+# One transaction for all four tables: a single commit at the end, and a
+# failed load leaves nothing half-inserted
+@transaction.atomic
 def generate_bulk_data(n_customers=10, n_services=5, n_purchases=20, n_payments=50):
-    # Generate data with pandas
-    customers = [CustomerFactory() for _ in range(n_customers)]
-    services = [ServiceFactory() for _ in range(n_services)]
-    purchases_data = pd.DataFrame(
-        {
-            "customer_id": np.random.choice([c.id for c in customers], n_purchases),
-            "service_id": np.random.choice([s.id for s in services], n_purchases),
-            "start_date": [
-                timezone.now() - timedelta(days=np.random.randint(1, 365))
-                for _ in range(n_purchases)
-            ],
-            "status": np.random.choice([e.value for e in PurchaseStatus], n_purchases),
-        }
+    # Build unsaved instances and insert each table in one statement;
+    # bulk_create sets the primary keys on PostgreSQL
+    customers = Customer.objects.bulk_create(
+        CustomerFactory.build_batch(n_customers), batch_size=1000
     )
-    purchases_data["end_date"] = purchases_data.apply(
-        lambda row: row["start_date"] + timedelta(days=30)
-        if Service.objects.get(id=row["service_id"]).is_recurring
-        else None,
-        axis=1,
+    services = Service.objects.bulk_create(
+        ServiceFactory.build_batch(n_services), batch_size=1000
     )
-    purchases = [
-        PurchaseWithExistingFactory(
-            customer_id=row["customer_id"],
-            service_id=row["service_id"],
-            start_date=row["start_date"],
-            end_date=row["end_date"] if pd.notna(row["end_date"]) else None,
-            status=row["status"],
-        )
-        for _, row in purchases_data.iterrows()
-    ]
-    payments_data = pd.DataFrame(
-        {
-            "customer_id": np.random.choice([c.id for c in customers], n_payments),
-            "purchase_id": np.random.choice([p.id for p in purchases], n_payments),
-            "amount": np.random.uniform(10, 200, n_payments),
-            "currency": np.random.choice([e.value for e in Currency], n_payments),
-            "payment_method": np.random.choice(
-                [e.value for e in PaymentMethod], n_payments
-            ),
-            "status": np.random.choice([e.value for e in PaymentStatus], n_payments),
-            "timestamp": [
-                timezone.now() - timedelta(days=np.random.randint(1, 365))
-                for _ in range(n_payments)
-            ],
-        }
+
+    # Build unsaved purchases from NumPy columns and insert them in batches;
+    # the services are already in memory, so look up is_recurring by index
+    customer_ids = np.random.choice([c.id for c in customers], n_purchases)
+    service_indices = np.random.randint(0, len(services), n_purchases)
+    service_ids = np.array([s.id for s in services])[service_indices]
+    is_recurring = np.array([s.is_recurring for s in services])[service_indices]
+    start_dates = random_past_datetimes(n_purchases)
+    statuses = np.random.choice(PURCHASE_STATUS_VALUES, n_purchases)
+    purchases = Purchase.objects.bulk_create(
+        [
+            Purchase(
+                customer_id=customer_id,
+                service_id=service_id,
+                start_date=start_date,
+                end_date=start_date + timedelta(days=30) if recurring else None,
+                status=status,
+            )
+            for customer_id, service_id, start_date, recurring, status in zip(
+                customer_ids.tolist(),
+                service_ids.tolist(),
+                start_dates,
+                is_recurring.tolist(),
+                statuses.tolist(),
+            )
+        ],
+        batch_size=1000,
     )
-    for _, row in payments_data.iterrows():
-        PaymentWithExistingFactory(
-            customer_id=row["customer_id"],
-            purchase_id=row["purchase_id"],
-            amount=row["amount"],
-            currency=row["currency"],
-            payment_method=row["payment_method"],
-            status=row["status"],
-            timestamp=row["timestamp"],
+
+    # Payments reference the primary keys set by bulk_create
+    payment_columns = {
+        "customer_id": np.random.choice([c.id for c in customers], n_payments),
+        "purchase_id": np.random.choice([p.id for p in purchases], n_payments),
+        "amount": np.random.uniform(10, 200, n_payments),
+        "currency": np.random.choice(CURRENCY_VALUES, n_payments),
+        "payment_method": np.random.choice(PAYMENT_METHOD_VALUES, n_payments),
+        "status": np.random.choice(PAYMENT_STATUS_VALUES, n_payments),
+    }
+    payment_columns = {
+        column: values.tolist() for column, values in payment_columns.items()
+    }
+    payment_columns["timestamp"] = random_past_datetimes(n_payments)
+
+    # Large loads stream through COPY; small ones stay on bulk_create
+    if n_payments >= COPY_THRESHOLD:
+        copy_rows(Payment, payment_columns)
+    else:
+        Payment.objects.bulk_create(
+            [
+                Payment(**dict(zip(payment_columns, row)))
+                for row in zip(*payment_columns.values())
+            ],
+            batch_size=1000,
         )
@@ -0,0 +1,18 @@
+from payments.db import ScopedSession
+
+
+class ScopedSessionMiddleware:
+    """Remove the thread-local SQLAlchemy session once a request finishes.
+
+    remove() closes the session, returning its connection to the engine pool,
+    so the next request on this thread starts with a fresh session.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            ScopedSession.remove()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['-timestamp'], include=('amount', 'status', 'customer', 'purchase'), name='pay_ts_desc_idx'),
+        ),
+    ]
@@ -113,3 +113,11 @@ class Payment(models.Model):
 
     class Meta:
         db_table = "payments"
+        indexes = [
+            # Serves the dashboard's newest-first payments without a sort
+            models.Index(
+                fields=["-timestamp"],
+                name="pay_ts_desc_idx",
+                include=["amount", "status", "customer", "purchase"],
+            ),
+        ]
@@ -0,0 +1,63 @@
+"""
+SQLAlchemy Core statements for the payments dashboard.
+
+The statements are built once at import and shared by the dashboard view and
+the query tests; run them with ``session.execute(STMT).all()``.
+"""
+
+from sqlalchemy import func, select
+
+from payments.models import PaymentMethod, PaymentStatus
+from payments.sqlalchemy_models import (
+    Payment as SAPayment,
+    Service as SAService,
+    Purchase as SAPurchase,
+    Customer as SACustomer,
+)
+
+# Payment statistics by service type
+# This includes:
+# - Total payments and amounts by service type
+# - Average payment amount by service type
+# - Success rate by service type
+# - Payment method distribution
+SERVICE_STATS_STMT = (
+    select(
+        SAService.type,
+        func.count(SAPayment.id).label("total_payments"),
+        func.sum(SAPayment.amount).label("total_amount"),
+        func.avg(SAPayment.amount).label("avg_amount"),
+        # COUNT(*) FILTER (WHERE ...) aggregates in the same single pass
+        func.count()
+        .filter(SAPayment.status == PaymentStatus.COMPLETED.value)
+        .label("successful_payments"),
+        func.count()
+        .filter(SAPayment.payment_method == PaymentMethod.CREDIT_CARD.value)
+        .label("credit_card_payments"),
+        func.count()
+        .filter(SAPayment.payment_method == PaymentMethod.BANK_TRANSFER.value)
+        .label("bank_transfer_payments"),
+        func.count()
+        .filter(SAPayment.payment_method == PaymentMethod.MOBILE_PAYMENT.value)
+        .label("mobile_payments"),
+    )
+    .select_from(SAPayment)
+    .join(SAPurchase, SAPayment.purchase_id == SAPurchase.id)
+    .join(SAService, SAPurchase.service_id == SAService.id)
+    .group_by(SAService.type)
+)
+
+# Top 5 customers by total payment amount
+TOP_CUSTOMERS_STMT = (
+    select(
+        SACustomer.name,
+        func.sum(SAPayment.amount).label("total_spent"),
+        func.count(SAPayment.id).label("payment_count"),
+        func.avg(SAPayment.amount).label("avg_payment"),
+    )
+    .select_from(SAPayment)
+    .join(SACustomer, SAPayment.customer_id == SACustomer.id)
+    .group_by(SACustomer.name)
+    .order_by(func.sum(SAPayment.amount).desc())
+    .limit(5)
+)
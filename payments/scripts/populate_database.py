@@ -9,13 +9,19 @@ This script populates the main database with:
 - 250,000 payments (using existing customers and purchases)
 
 It clears all existing data before populating.
+
+Pass --fast to generate placeholder customers, purchases and payments
+server-side with generate_series instead of Faker and NumPy.
 """
 
+import argparse
+import io
+import multiprocessing
 import os
 import sys
 import django
 import numpy as np
-from datetime import timedelta, datetime
+from datetime import datetime
 from django.utils import timezone
 
 # Add the project root to the Python path
@@ -28,6 +34,11 @@ sys.path.append(
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "payments_dashboard_mini.settings")
 django.setup()
 
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Abs
+from psycopg2.extras import execute_values
+
 from payments.models import (
     AccountStatus,
     BillingCycle,
@@ -44,7 +55,6 @@ from payments.models import (
 from payments.factories import (
     CustomerFactory,
     PaymentWithExistingFactory,
-    PurchaseWithExistingFactory,
     ServiceFactory,
 )
 
@@ -54,32 +64,55 @@ N_SERVICES = 20
 N_PURCHASES = 2000
 N_PAYMENTS = 2000
 
-# Custom telecom service names
-TELECOM_SERVICES = [
-    # Internet Services
-    "Fiber Optic 100Mbps",
-    "Fiber Optic 500Mbps",
-    "Fiber Optic 1Gbps",
-    "Cable Internet 50Mbps",
-    "Cable Internet 200Mbps",
-    "DSL Internet 25Mbps",
-    "DSL Internet 50Mbps",
-    "Wireless Internet 100Mbps",
-    # Mobile Services
-    "Mobile Plan 5GB",
-    "Mobile Plan 10GB",
-    "Mobile Plan 20GB",
-    "Mobile Plan Unlimited",
-    "Mobile Plan Family 4GB",
-    "Mobile Plan Family 10GB",
-    "Mobile Plan Business 50GB",
-    # TV Services
-    "Basic TV Package",
-    "Premium TV Package",
-    "Sports TV Package",
-    "Movie TV Package",
-    "Family TV Package",
-]
+# Rows per INSERT statement for bulk_create
+BULK_BATCH_SIZE = 5000
+
+# Stream payments with COPY; set to False to fall back to multi-row INSERTs
+# (e.g. behind a proxy or managed database that does not support COPY)
+USE_COPY = True
+INSERT_PAGE_SIZE = 1000
+
+# Processes streaming payment COPYs in parallel (e.g. os.cpu_count()). With
+# more than one, each worker commits its own slice, so the load commits in
+# stages instead of as one transaction
+COPY_WORKERS = 1
+
+# Session settings applied with SET LOCAL for the population transaction
+BULK_LOAD_SETTINGS = {
+    # Don't wait for the WAL flush when the load commits
+    "synchronous_commit": "OFF",
+    "work_mem": "'256MB'",
+    # Memory for rebuilding the dropped indexes and foreign keys
+    "maintenance_work_mem": "'1GB'",
+}
+
+# Custom telecom services: name -> (type, base price range (low, high))
+SERVICE_META = {
+    # Internet: higher speeds = higher prices
+    "Fiber Optic 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    "Fiber Optic 500Mbps": (ServiceType.INTERNET, (50, 80)),
+    "Fiber Optic 1Gbps": (ServiceType.INTERNET, (80, 120)),
+    "Cable Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Cable Internet 200Mbps": (ServiceType.INTERNET, (40, 60)),
+    "DSL Internet 25Mbps": (ServiceType.INTERNET, (15, 25)),
+    "DSL Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Wireless Internet 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    # Mobile: more data = higher prices
+    "Mobile Plan 5GB": (ServiceType.MOBILE, (15, 25)),
+    "Mobile Plan 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan 20GB": (ServiceType.MOBILE, (25, 35)),
+    "Mobile Plan Unlimited": (ServiceType.MOBILE, (40, 60)),
+    "Mobile Plan Family 4GB": (ServiceType.MOBILE, (30, 45)),
+    "Mobile Plan Family 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan Business 50GB": (ServiceType.MOBILE, (35, 50)),
+    # TV
+    "Basic TV Package": (ServiceType.TV, (15, 25)),
+    "Premium TV Package": (ServiceType.TV, (30, 50)),
+    "Sports TV Package": (ServiceType.TV, (20, 35)),
+    "Movie TV Package": (ServiceType.TV, (20, 35)),
+    "Family TV Package": (ServiceType.TV, (15, 25)),
+}
+TELECOM_SERVICES = list(SERVICE_META)
 
 # Service popularity weights (higher = more popular)
 # Using normal distribution to create realistic popularity
@@ -112,6 +145,16 @@ SERVICE_POPULARITY_WEIGHTS = (
     SERVICE_POPULARITY_WEIGHTS / SERVICE_POPULARITY_WEIGHTS.sum()
 )
 
+# Cumulative popularity for inverse-CDF sampling; pin the last bucket to 1.0
+# so rounding can never push a draw past the final service
+SERVICE_POPULARITY_CDF = np.cumsum(SERVICE_POPULARITY_WEIGHTS)
+SERVICE_POPULARITY_CDF[-1] = 1.0
+
+# Enum values to sample payment attributes from
+CURRENCY_VALUES = np.array([e.value for e in Currency], dtype=np.int8)
+PAYMENT_METHOD_VALUES = np.array([e.value for e in PaymentMethod], dtype=np.int8)
+PAYMENT_STATUS_VALUES = np.array([e.value for e in PaymentStatus], dtype=np.int8)
+
 
 def clear_database():
     """Clear all existing data from the database tables."""
@@ -130,13 +173,10 @@ def create_customers(n_customers=N_CUSTOMERS):
     """Create the specified number of customers."""
     print(f"Creating {n_customers} customers...")
 
-    customers = []
-    for i in range(n_customers):
-        customer = CustomerFactory()
-        customers.append(customer)
-
-        if (i + 1) % 1000 == 0:
-            print(f"Created {i + 1} customers...")
+    # Build unsaved instances and insert them in batches instead of one
+    # INSERT (and commit) per factory call
+    customers = [CustomerFactory.build() for _ in range(n_customers)]
+    customers = Customer.objects.bulk_create(customers, batch_size=BULK_BATCH_SIZE)
 
     print(f"Successfully created {len(customers)} customers.")
     return customers
@@ -146,71 +186,24 @@ def create_custom_services():
     """Create custom telecom services with predefined names and realistic pricing."""
     print(f"Creating {len(TELECOM_SERVICES)} custom telecom services...")
 
-    services = []
-    for i, service_name in enumerate(TELECOM_SERVICES):
-        # Determine service type based on name
-        if (
-            "Internet" in service_name
-            or "Fiber" in service_name
-            or "Cable" in service_name
-            or "DSL" in service_name
-            or "Wireless" in service_name
-        ):
-            service_type = ServiceType.INTERNET
-            # Higher speeds = higher prices
-            if "1Gbps" in service_name:
-                base_price = np.random.uniform(80, 120)
-            elif "500Mbps" in service_name:
-                base_price = np.random.uniform(50, 80)
-            elif "200Mbps" in service_name:
-                base_price = np.random.uniform(40, 60)
-            elif "100Mbps" in service_name:
-                base_price = np.random.uniform(25, 45)
-            elif "50Mbps" in service_name:
-                base_price = np.random.uniform(20, 35)
-            else:  # 25Mbps
-                base_price = np.random.uniform(15, 25)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        elif "Mobile" in service_name:
-            service_type = ServiceType.MOBILE
-            # More data = higher prices
-            if "Unlimited" in service_name:
-                base_price = np.random.uniform(40, 60)
-            elif "50GB" in service_name:
-                base_price = np.random.uniform(35, 50)
-            elif "20GB" in service_name:
-                base_price = np.random.uniform(25, 35)
-            elif "10GB" in service_name:
-                base_price = np.random.uniform(20, 30)
-            elif "5GB" in service_name:
-                base_price = np.random.uniform(15, 25)
-            else:  # Family plans
-                base_price = np.random.uniform(30, 45)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        else:  # TV services
-            service_type = ServiceType.TV
-            if "Premium" in service_name:
-                base_price = np.random.uniform(30, 50)
-            elif "Sports" in service_name or "Movie" in service_name:
-                base_price = np.random.uniform(20, 35)
-            else:  # Basic and Family
-                base_price = np.random.uniform(15, 25)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-
-        service = Service.objects.create(
-            name=service_name,
+    # Draw every base price in one call from the per-service ranges
+    service_types, price_ranges = zip(*SERVICE_META.values())
+    lows, highs = np.array(price_ranges).T
+    base_prices = np.random.uniform(lows, highs).tolist()
+
+    services = [
+        Service(
+            name=name,
             type=service_type,
             base_price=base_price,
-            is_recurring=is_recurring,
-            billing_cycle=billing_cycle,
+            is_recurring=True,
+            billing_cycle=BillingCycle.MONTHLY,
         )
-        services.append(service)
-
-        if (i + 1) % 10 == 0:
-            print(f"Created {i + 1} services...")
+        for name, service_type, base_price in zip(
+            SERVICE_META, service_types, base_prices
+        )
+    ]
+    services = Service.objects.bulk_create(services)
 
     print(f"Successfully created {len(services)} custom telecom services.")
     return services
@@ -224,88 +217,396 @@ def create_purchases_with_popularity(
         f"Creating {n_purchases} purchases with popularity-based service selection..."
     )
 
-    if not customers:
-        customers = list(Customer.objects.all())
+    if customers:
+        customer_ids = np.fromiter(
+            (c.pk for c in customers), dtype=np.int64, count=len(customers)
+        )
+    else:
+        customer_ids = np.fromiter(
+            Customer.objects.values_list("id", flat=True), dtype=np.int64
+        )
     if not services:
         services = list(Service.objects.all())
 
-    if not customers or not services:
+    if not customer_ids.size or not services:
         raise ValueError("No customers or services available for purchase creation")
 
-    purchases = []
-    for i in range(n_purchases):
-        # Select customer randomly
-        customer = np.random.choice(customers)
+    service_ids = np.fromiter(
+        (s.pk for s in services), dtype=np.int64, count=len(services)
+    )
+    service_is_recurring = np.fromiter(
+        (s.is_recurring for s in services), dtype=bool, count=len(services)
+    )
 
-        # Select service based on popularity weights (normal distribution)
-        service = np.random.choice(services, p=SERVICE_POPULARITY_WEIGHTS)
+    # Draw every customer and popularity-weighted service pick in one call each
+    customer_idx = np.random.randint(0, len(customer_ids), n_purchases)
+    service_idx = np.searchsorted(
+        SERVICE_POPULARITY_CDF, np.random.random(n_purchases), side="right"
+    )
+    start_offsets = np.random.randint(1, 365, n_purchases)
+    statuses = np.random.choice([e.value for e in PurchaseStatus], n_purchases)
+
+    purchase_customer_ids = customer_ids[customer_idx]
+    purchase_service_ids = service_ids[service_idx]
+    purchase_is_recurring = service_is_recurring[service_idx]
+
+    # Same datetime64 arithmetic as the payment timestamps; recurring
+    # purchases end 30 days after they start
+    now = np.datetime64(timezone.now().replace(tzinfo=None), "us")
+    start_dates = now - start_offsets.astype("timedelta64[D]")
+    end_dates = np.datetime_as_string(
+        start_dates + np.timedelta64(30, "D"), timezone="UTC"
+    ).astype(object)
+    end_dates[~purchase_is_recurring] = None
+
+    # Send every column as one array parameter and let unnest() zip them back
+    # into rows: a single statement and round trip, with no model instances
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO purchases (customer_id, service_id, start_date, end_date, status)
+            SELECT * FROM unnest(
+                %s::bigint[], %s::bigint[], %s::timestamptz[], %s::timestamptz[], %s::int[]
+            )
+            """,
+            [
+                purchase_customer_ids.tolist(),
+                purchase_service_ids.tolist(),
+                np.datetime_as_string(start_dates, timezone="UTC").tolist(),
+                end_dates.tolist(),
+                statuses.tolist(),
+            ],
+        )
 
-        # Create purchase with existing customer and service
-        purchase = PurchaseWithExistingFactory(customer=customer, service=service)
-        purchases.append(purchase)
+    print(f"Successfully created {n_purchases} purchases.")
+    return n_purchases
 
-        if (i + 1) % 1000 == 0:
-            print(f"Created {i + 1} purchases...")
 
-    print(f"Successfully created {len(purchases)} purchases.")
-    return purchases
+def drop_indexes_and_foreign_keys(table_name):
+    """Drop a table's secondary indexes and foreign keys, returning the SQL to restore them."""
+    with connection.cursor() as cursor:
+        # ALTER TABLE refuses to run while deferred FK checks are still queued
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype = 'f'
+            """,
+            [table_name],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND NOT x.indisprimary
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.oid)
+            """,
+            [table_name],
+        )
+        indexes = cursor.fetchall()
+
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE {table_name} DROP CONSTRAINT "{name}"')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+
+    # Indexes first so the foreign key validation can use them
+    return [definition for _, definition in indexes] + [
+        f'ALTER TABLE {table_name} ADD CONSTRAINT "{name}" {definition}'
+        for name, definition in foreign_keys
+    ]
+
+
+def restore_indexes_and_foreign_keys(restore_statements):
+    """Recreate indexes and foreign keys dropped by drop_indexes_and_foreign_keys."""
+    with connection.cursor() as cursor:
+        for statement in restore_statements:
+            cursor.execute(statement)
+
+
+def copy_columns(table_name, columns):
+    """Stream column arrays into a table using PostgreSQL COPY FROM STDIN.
+
+    Each column is converted to strings in one NumPy call; the rows are then
+    joined into CSV lines one Python tuple at a time with str.join, without
+    the csv module's per-value quoting. Values must not contain commas or
+    quotes.
+    """
+    text_columns = [
+        np.asarray(values).astype(str).tolist() for values in columns.values()
+    ]
+    buffer = io.StringIO()
+    buffer.write("\n".join(map(",".join, zip(*text_columns))))
+    buffer.write("\n")
+    buffer.seek(0)
+
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH CSV", buffer
+        )
+
+
+def copy_worker(table_name, columns):
+    """Pool worker: COPY one slice of rows over this process's own connection."""
+    try:
+        with transaction.atomic():
+            apply_bulk_load_settings()
+            copy_columns(table_name, columns)
+    finally:
+        connection.close()
+
+
+def parallel_copy_columns(table_name, columns, workers=COPY_WORKERS):
+    """Split column arrays into contiguous row ranges and COPY them from several
+    processes at once.
+
+    Workers commit independently and cannot see uncommitted rows, so this must
+    not run inside the transaction that created the referenced rows.
+    """
+    chunks = [
+        dict(zip(columns, slices))
+        for slices in zip(
+            *(
+                np.array_split(np.asarray(values), workers)
+                for values in columns.values()
+            )
+        )
+    ]
+    # spawn rather than fork so workers don't inherit the parent's connection
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        pool.starmap(copy_worker, [(table_name, chunk) for chunk in chunks])
+
+
+def insert_columns(table_name, columns):
+    """Insert column arrays with multi-row INSERT statements when COPY is not available."""
+    rows = zip(*(np.asarray(values).tolist() for values in columns.values()))
+    with connection.cursor() as cursor:
+        execute_values(
+            cursor.cursor,
+            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES %s",
+            rows,
+            page_size=INSERT_PAGE_SIZE,
+        )
 
 
 def create_payments(n_payments=N_PAYMENTS, customers=None, purchases=None):
     """Create payments using existing customers and purchases with amounts matching service base prices."""
     print(f"Creating {n_payments} payments...")
 
-    if not customers:
-        customers = list(Customer.objects.all())
-    if not purchases:
-        purchases = list(Purchase.objects.all())
+    # Work on plain id arrays; fall back to id-only queries rather than
+    # materializing model instances
+    if customers:
+        customer_ids = np.fromiter(
+            (c.pk for c in customers), dtype=np.int64, count=len(customers)
+        )
+    else:
+        customer_ids = np.fromiter(
+            Customer.objects.values_list("id", flat=True), dtype=np.int64
+        )
+    if purchases:
+        purchase_rows = [(p.pk, p.customer_id, p.service_id) for p in purchases]
+    else:
+        purchase_rows = list(
+            Purchase.objects.values_list("id", "customer_id", "service_id")
+        )
 
-    if not customers or not purchases:
+    if not customer_ids.size or not purchase_rows:
         raise ValueError("No customers or purchases available for payment creation")
 
-    payments = []
-    purchase_customer_payments = 0
-    different_customer_payments = 0
-
-    for i in range(n_payments):
-        # Randomly select purchase
-        purchase = np.random.choice(purchases)
-
-        # 95% chance the payment customer is the same as purchase customer
-        # 5% chance it's a random different customer
-        if np.random.random() < 0.95:
-            # Use the purchase customer (95% of cases)
-            customer = purchase.customer
-            purchase_customer_payments += 1
-        else:
-            # Use a random different customer (5% of cases)
-            other_customers = [c for c in customers if c != purchase.customer]
-            customer = np.random.choice(other_customers)
-            different_customer_payments += 1
-
-        # Create payment with amount matching the service base price
-        payment = Payment.objects.create(
-            customer=customer,
-            purchase=purchase,
-            amount=purchase.service.base_price,  # Use service base price
-            currency=np.random.choice([e.value for e in Currency]),
-            payment_method=np.random.choice([e.value for e in PaymentMethod]),
-            status=np.random.choice([e.value for e in PaymentStatus]),
-            timestamp=timezone.now() - timedelta(days=np.random.randint(1, 365)),
+    # Sorted so a customer's position can be found with a binary search
+    customer_ids.sort()
+    purchase_ids, purchase_customer_ids, purchase_service_ids = np.array(
+        purchase_rows, dtype=np.int64
+    ).T
+
+    # Gather each purchase's service base price from a dense price table
+    service_rows = list(Service.objects.order_by("id").values_list("id", "base_price"))
+    service_ids = np.array([row[0] for row in service_rows], dtype=np.int64)
+    service_prices = np.array([row[1] for row in service_rows], dtype=np.float64)
+    purchase_amounts = service_prices[
+        np.searchsorted(service_ids, purchase_service_ids)
+    ]
+
+    # Pick every payment's purchase once and gather its columns by index
+    picks = np.random.randint(0, len(purchase_ids), n_payments)
+    payment_purchase_ids = purchase_ids[picks]
+    payment_customer_ids = purchase_customer_ids[picks]
+    payment_amounts = purchase_amounts[picks]
+
+    # 95% of payments come from the purchase customer; the other 5% from a
+    # random different customer, drawn from all but one slot by stepping over
+    # the purchase customer's position. With a single customer there is no
+    # other one to pick, so every payment keeps the purchase customer
+    if len(customer_ids) > 1:
+        different_customer = np.random.random(n_payments) >= 0.95
+    else:
+        different_customer = np.zeros(n_payments, dtype=bool)
+    different_customer_payments = int(different_customer.sum())
+    purchase_customer_payments = n_payments - different_customer_payments
+    if different_customer_payments:
+        purchase_customer_idx = np.searchsorted(
+            customer_ids, payment_customer_ids[different_customer]
         )
-        payments.append(payment)
-
-        if (i + 1) % 1000 == 0:
-            print(f"Created {i + 1} payments...")
+        other_idx = np.random.randint(
+            0, len(customer_ids) - 1, different_customer_payments
+        )
+        other_idx[other_idx >= purchase_customer_idx] += 1
+        payment_customer_ids[different_customer] = customer_ids[other_idx]
+
+    # Draw each payment attribute column in one vectorized call
+    currencies = CURRENCY_VALUES[np.random.randint(0, len(CURRENCY_VALUES), n_payments)]
+    payment_methods = PAYMENT_METHOD_VALUES[
+        np.random.randint(0, len(PAYMENT_METHOD_VALUES), n_payments)
+    ]
+    statuses = PAYMENT_STATUS_VALUES[
+        np.random.randint(0, len(PAYMENT_STATUS_VALUES), n_payments)
+    ]
+    # Offset a single "now" by whole days in datetime64, then format as
+    # explicit UTC strings for the write
+    now = np.datetime64(timezone.now().replace(tzinfo=None), "us")
+    timestamps = now - np.random.randint(1, 365, n_payments).astype("timedelta64[D]")
+    timestamps = np.datetime_as_string(timestamps, timezone="UTC")
+
+    # Payment amount matches the service base price
+    payment_columns = {
+        "customer_id": payment_customer_ids,
+        "purchase_id": payment_purchase_ids,
+        "amount": payment_amounts,
+        "currency": currencies,
+        "payment_method": payment_methods,
+        "status": statuses,
+        "timestamp": timestamps,
+    }
+    if USE_COPY and COPY_WORKERS > 1:
+        print(f"Inserting payments using {COPY_WORKERS} parallel COPY workers...")
+        parallel_copy_columns("payments", payment_columns)
+    elif USE_COPY:
+        # Stream all rows in a single COPY instead of one INSERT per payment
+        print("Inserting payments using PostgreSQL COPY command...")
+        copy_columns("payments", payment_columns)
+    else:
+        print("Inserting payments using multi-row INSERT statements...")
+        insert_columns("payments", payment_columns)
 
-    print(f"Successfully created {len(payments)} payments.")
+    print(f"Successfully created {n_payments} payments.")
     print(
         f"  - Payments by purchase customer: {purchase_customer_payments} ({(purchase_customer_payments / n_payments) * 100:.1f}%)"
     )
     print(
         f"  - Payments by different customer: {different_customer_payments} ({(different_customer_payments / n_payments) * 100:.1f}%)"
     )
-    return payments
+    return n_payments
+
+
+def random_choice_sql(values):
+    """SQL expression picking one of the given integers per row with random()."""
+    return f"(ARRAY{list(values)})[1 + floor(random() * {len(values)})::int]"
+
+
+def create_customers_server_side(n_customers=N_CUSTOMERS):
+    """Create placeholder customers entirely in PostgreSQL with generate_series."""
+    print(f"Creating {n_customers} customers server-side...")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO customers (name, email, account_status)
+            SELECT 'cust_' || g, 'cust_' || g || '@example.com',
+                   {random_choice_sql([e.value for e in AccountStatus])}
+            FROM generate_series(1, %s) AS g
+            """,
+            [n_customers],
+        )
+        created = cursor.rowcount
+
+    print(f"Successfully created {created} customers.")
+    return created
+
+
+def create_purchases_server_side(services, n_purchases=N_PURCHASES):
+    """Create purchases in PostgreSQL, picking customers and popularity-weighted
+    services with the server's random()."""
+    print(f"Creating {n_purchases} purchases server-side...")
+
+    # width_bucket() counts the thresholds <= random(), i.e. the same inverse
+    # CDF lookup as searchsorted(side="right"), but 1-based for array indexing
+    thresholds = [0.0] + SERVICE_POPULARITY_CDF[:-1].tolist()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO purchases (customer_id, service_id, start_date, end_date, status)
+            SELECT p.customer_id, p.service_id, p.start_date,
+                   CASE WHEN s.is_recurring THEN p.start_date + interval '30 days' END,
+                   p.status
+            FROM (
+                SELECT c.ids[1 + floor(random() * cardinality(c.ids))::int] AS customer_id,
+                       (%(service_ids)s::bigint[])[
+                           width_bucket(random(), %(thresholds)s::float8[])
+                       ] AS service_id,
+                       now() - (1 + floor(random() * 364)) * interval '1 day' AS start_date,
+                       {random_choice_sql([e.value for e in PurchaseStatus])} AS status
+                FROM generate_series(1, %(n)s),
+                     (SELECT array_agg(id) AS ids FROM customers) AS c
+            ) AS p
+            JOIN services AS s ON s.id = p.service_id
+            """,
+            {
+                "service_ids": [s.pk for s in services],
+                "thresholds": thresholds,
+                "n": n_purchases,
+            },
+        )
+        created = cursor.rowcount
+
+    print(f"Successfully created {created} purchases.")
+    return created
+
+
+def create_payments_server_side(n_payments=N_PAYMENTS):
+    """Create payments in PostgreSQL with amounts matching service base prices."""
+    print(f"Creating {n_payments} payments server-side...")
+
+    # 5% of payments come from a different customer: pick one of the first
+    # n - 1 customers and swap a clash with the purchase customer for the last
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO payments
+                (customer_id, purchase_id, amount, currency, payment_method, status, timestamp)
+            SELECT CASE
+                       WHEN NOT x.different_customer THEN p.customer_id
+                       WHEN x.other_customer_id = p.customer_id THEN x.last_customer_id
+                       ELSE x.other_customer_id
+                   END,
+                   p.id, s.base_price, x.currency, x.payment_method, x.status, x.timestamp
+            FROM (
+                SELECT pu.ids[1 + floor(random() * cardinality(pu.ids))::int] AS purchase_id,
+                       random() >= 0.95 AS different_customer,
+                       c.ids[1 + floor(random() * (cardinality(c.ids) - 1))::int]
+                           AS other_customer_id,
+                       c.ids[cardinality(c.ids)] AS last_customer_id,
+                       {random_choice_sql(CURRENCY_VALUES.tolist())} AS currency,
+                       {random_choice_sql(PAYMENT_METHOD_VALUES.tolist())} AS payment_method,
+                       {random_choice_sql(PAYMENT_STATUS_VALUES.tolist())} AS status,
+                       now() - (1 + floor(random() * 364)) * interval '1 day' AS timestamp
+                FROM generate_series(1, %s),
+                     (SELECT array_agg(id) AS ids FROM purchases) AS pu,
+                     (SELECT array_agg(id) AS ids FROM customers) AS c
+            ) AS x
+            JOIN purchases AS p ON p.id = x.purchase_id
+            JOIN services AS s ON s.id = p.service_id
+            """,
+            [n_payments],
+        )
+        created = cursor.rowcount
+
+    print(f"Successfully created {created} payments.")
+    return created
 
 
 def print_service_popularity_stats():
@@ -313,10 +614,16 @@ def print_service_popularity_stats():
     print("\nService Popularity Statistics:")
     print("-" * 50)
 
-    services = list(Service.objects.all())
-    for i, service in enumerate(services):
-        purchase_count = service.purchases.count()
-        popularity_percentage = (purchase_count / Purchase.objects.count()) * 100
+    # One GROUP BY query for all per-service counts
+    purchase_counts = dict(
+        Purchase.objects.values_list("service_id").annotate(count=Count("id"))
+    )
+    total_purchases = sum(purchase_counts.values())
+
+    services = Service.objects.in_bulk()
+    for service_id, service in services.items():
+        purchase_count = purchase_counts.get(service_id, 0)
+        popularity_percentage = (purchase_count / total_purchases) * 100
         print(
             f"{service.name}: {purchase_count} purchases ({popularity_percentage:.1f}%)"
         )
@@ -327,20 +634,21 @@ def verify_payment_amounts():
     print("\nPayment Verification:")
     print("-" * 50)
 
-    total_payments = Payment.objects.count()
-    correct_amounts = 0
-    matching_customers = 0
-
-    for payment in Payment.objects.all():
-        # Check if amount matches service price
-        if (
-            abs(payment.amount - payment.purchase.service.base_price) < 0.01
-        ):  # Allow for floating point precision
-            correct_amounts += 1
-
-        # Check if payment customer matches purchase customer
-        if payment.customer == payment.purchase.customer:
-            matching_customers += 1
+    # Count everything in one aggregate query instead of loading each payment
+    # and its purchase, service and customer rows
+    counts = Payment.objects.annotate(
+        amount_difference=Abs(F("amount") - F("purchase__service__base_price"))
+    ).aggregate(
+        total_payments=Count("id"),
+        # Allow for floating point precision
+        correct_amounts=Count("id", filter=Q(amount_difference__lt=0.01)),
+        matching_customers=Count(
+            "id", filter=Q(customer_id=F("purchase__customer_id"))
+        ),
+    )
+    total_payments = counts["total_payments"]
+    correct_amounts = counts["correct_amounts"]
+    matching_customers = counts["matching_customers"]
 
     amount_accuracy = (correct_amounts / total_payments) * 100
     customer_accuracy = (matching_customers / total_payments) * 100
@@ -369,7 +677,9 @@ def verify_payment_amounts():
     # Show a few examples
     print("\nSample Payment Details:")
     print("-" * 30)
-    for payment in Payment.objects.all()[:5]:
+    for payment in Payment.objects.select_related(
+        "customer", "purchase__customer", "purchase__service"
+    )[:5]:
         service_name = payment.purchase.service.name
         service_price = payment.purchase.service.base_price
         payment_amount = payment.amount
@@ -381,31 +691,92 @@ def verify_payment_amounts():
         )
 
 
+def apply_bulk_load_settings():
+    """Apply BULK_LOAD_SETTINGS to the current transaction."""
+    # SET LOCAL reverts these when the transaction ends
+    with connection.cursor() as cursor:
+        for name, value in BULK_LOAD_SETTINGS.items():
+            cursor.execute(f"SET LOCAL {name} = {value}")
+
+
+def finish_load(restore_statements):
+    """Recreate the dropped indexes and foreign keys and refresh statistics."""
+    print("Recreating purchase and payment indexes and foreign keys...")
+    restore_indexes_and_foreign_keys(restore_statements)
+
+    # Refresh planner statistics for the freshly loaded tables
+    print("Analyzing populated tables...")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE customers, services, purchases, payments")
+
+
 def main():
     """Main function to populate the database."""
+    parser = argparse.ArgumentParser(description="Populate the payments database.")
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="generate placeholder customers, purchases and payments in SQL with "
+        "generate_series instead of Faker and NumPy",
+    )
+    fast = parser.parse_args().fast
+
     start_time = datetime.now()
     print("Starting database population...")
     print("=" * 50)
     print(f"Start time: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 50)
 
-    try:
-        # Clear existing data
-        clear_database()
-
-        # Create customers
-        customers = create_customers()
-
-        # Create custom telecom services
-        services = create_custom_services()
+    # Parallel COPY workers use their own connections, which can neither see
+    # this transaction's rows nor write past the locks its dropped constraints
+    # hold, so in that case everything else commits before the payments load
+    parallel_copy = not fast and USE_COPY and COPY_WORKERS > 1
 
-        # Create purchases using existing customers and services with popularity
-        purchases = create_purchases_with_popularity(
-            customers=customers, services=services
-        )
-
-        # Create payments using existing customers and purchases
-        payments = create_payments(customers=customers, purchases=purchases)
+    try:
+        # Run the whole population as one transaction so it commits once
+        with transaction.atomic():
+            apply_bulk_load_settings()
+
+            # Clear existing data
+            clear_database()
+
+            # Create customers
+            if fast:
+                create_customers_server_side()
+            else:
+                customers = create_customers()
+
+            # Create custom telecom services
+            services = create_custom_services()
+
+            # Load purchases and payments without per-row index and FK
+            # maintenance, then build each index once afterwards
+            print("Dropping purchase and payment indexes and foreign keys...")
+            restore_statements = []
+            for table_name in ("purchases", "payments"):
+                restore_statements += drop_indexes_and_foreign_keys(table_name)
+
+            if fast:
+                create_purchases_server_side(services)
+                create_payments_server_side()
+            else:
+                # Create purchases using existing customers and services with popularity
+                create_purchases_with_popularity(customers=customers, services=services)
+
+                # Create payments using existing customers and purchases
+                if not parallel_copy:
+                    create_payments(customers=customers)
+
+            if not parallel_copy:
+                finish_load(restore_statements)
+
+        if parallel_copy:
+            try:
+                create_payments(customers=customers)
+            finally:
+                with transaction.atomic():
+                    apply_bulk_load_settings()
+                    finish_load(restore_statements)
 
         # Calculate end time and elapsed time
         end_time = datetime.now()
@@ -11,16 +11,18 @@ This script populates the main database with (see constants below for numbers):
 It uses SQLAlchemy with bulk operations for maximum performance.
 """
 
+import argparse
+import io
 import os
-import random
 import sys
-from concurrent.futures import ProcessPoolExecutor
-from datetime import datetime, timedelta
+from datetime import datetime
 
 import numpy as np
-from faker import Faker
+import pandas as pd
+from psycopg2.extras import execute_values
 
 # from sqlalchemy.orm import joinedload
+from sqlalchemy import create_engine, func
 from sqlalchemy.sql import text
 
 # Add the project root to the Python path
@@ -29,7 +31,7 @@ sys.path.append(
 )
 
 # Import SQLAlchemy components
-from payments.db import close_session, get_session
+from payments.db import DATABASE_URL, SessionLocal, close_session
 from payments.sqlalchemy_models import (
     AccountStatus,
     BillingCycle,
@@ -44,9 +46,6 @@ from payments.sqlalchemy_models import (
     ServiceType,
 )
 
-# Initialize Faker
-fake = Faker()
-
 # Constants high performance
 N_CUSTOMERS = 200_000
 N_SERVICES = 20
@@ -59,32 +58,42 @@ N_PAYMENTS = 200_000
 # N_PURCHASES = 20_000
 # N_PAYMENTS = 20_000
 
-# Custom telecom service names
-TELECOM_SERVICES = [
-    # Internet Services
-    "Fiber Optic 100Mbps",
-    "Fiber Optic 500Mbps",
-    "Fiber Optic 1Gbps",
-    "Cable Internet 50Mbps",
-    "Cable Internet 200Mbps",
-    "DSL Internet 25Mbps",
-    "DSL Internet 50Mbps",
-    "Wireless Internet 100Mbps",
-    # Mobile Services
-    "Mobile Plan 5GB",
-    "Mobile Plan 10GB",
-    "Mobile Plan 20GB",
-    "Mobile Plan Unlimited",
-    "Mobile Plan Family 4GB",
-    "Mobile Plan Family 10GB",
-    "Mobile Plan Business 50GB",
-    # TV Services
-    "Basic TV Package",
-    "Premium TV Package",
-    "Sports TV Package",
-    "Movie TV Package",
-    "Family TV Package",
-]
+# The loader runs everything on one session connection, so it gets its own
+# single-connection engine instead of the shared engine's larger pool
+load_engine = create_engine(DATABASE_URL, pool_size=1, max_overflow=0)
+
+# Load tables with COPY; set to False to fall back to multi-row INSERTs
+# (e.g. behind a proxy or managed database that does not support COPY)
+USE_COPY = True
+INSERT_PAGE_SIZE = 1000
+
+# Custom telecom services: name -> (type, base price range (low, high))
+SERVICE_META = {
+    # Internet: higher speeds = higher prices
+    "Fiber Optic 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    "Fiber Optic 500Mbps": (ServiceType.INTERNET, (50, 80)),
+    "Fiber Optic 1Gbps": (ServiceType.INTERNET, (80, 120)),
+    "Cable Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Cable Internet 200Mbps": (ServiceType.INTERNET, (40, 60)),
+    "DSL Internet 25Mbps": (ServiceType.INTERNET, (15, 25)),
+    "DSL Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Wireless Internet 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    # Mobile: more data = higher prices
+    "Mobile Plan 5GB": (ServiceType.MOBILE, (15, 25)),
+    "Mobile Plan 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan 20GB": (ServiceType.MOBILE, (25, 35)),
+    "Mobile Plan Unlimited": (ServiceType.MOBILE, (40, 60)),
+    "Mobile Plan Family 4GB": (ServiceType.MOBILE, (30, 45)),
+    "Mobile Plan Family 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan Business 50GB": (ServiceType.MOBILE, (35, 50)),
+    # TV
+    "Basic TV Package": (ServiceType.TV, (15, 25)),
+    "Premium TV Package": (ServiceType.TV, (30, 50)),
+    "Sports TV Package": (ServiceType.TV, (20, 35)),
+    "Movie TV Package": (ServiceType.TV, (20, 35)),
+    "Family TV Package": (ServiceType.TV, (15, 25)),
+}
+TELECOM_SERVICES = list(SERVICE_META)
 
 # Service popularity weights (higher = more popular)
 SERVICE_POPULARITY_WEIGHTS = [
@@ -116,17 +125,159 @@ SERVICE_POPULARITY_WEIGHTS = (
     SERVICE_POPULARITY_WEIGHTS / SERVICE_POPULARITY_WEIGHTS.sum()
 )
 
+# Cumulative popularity for inverse-CDF sampling; pin the last bucket to 1.0
+# so rounding can never push a draw past the final service
+SERVICE_POPULARITY_CDF = np.cumsum(SERVICE_POPULARITY_WEIGHTS)
+SERVICE_POPULARITY_CDF[-1] = 1.0
+
+# Random generator (PCG64) for all generated data; pass an int seed for
+# reproducible runs
+rng = np.random.default_rng()
+
+# Enum values to sample generated columns from
+ACCOUNT_STATUS_VALUES = np.array([e.value for e in AccountStatus], dtype=np.int8)
+PURCHASE_STATUS_VALUES = np.array([e.value for e in PurchaseStatus], dtype=np.int8)
+CURRENCY_VALUES = np.array([e.value for e in Currency], dtype=np.int8)
+PAYMENT_METHOD_VALUES = np.array([e.value for e in PaymentMethod], dtype=np.int8)
+PAYMENT_STATUS_VALUES = np.array([e.value for e in PaymentStatus], dtype=np.int8)
+
+
+def copy_dataframe(session, table_name, df):
+    """Stream a DataFrame into a table with PostgreSQL COPY FROM STDIN.
+
+    Runs on the session's own connection, so it is part of the session
+    transaction. Missing values (None/NaT) are written as NULL.
+    """
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table_name} ({', '.join(df.columns)}) FROM STDIN WITH CSV",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def reserve_ids(session, table_name, n):
+    """Reserve n consecutive primary keys from a table's id sequence.
+
+    COPY does not return generated ids, so rows are written with ids taken
+    from this block and the generated associations can be kept in memory.
+    """
+    if n <= 0:
+        # Nothing to reserve; setval would move the sequence backwards
+        return np.empty(0, dtype=np.int64)
+
+    params = {"table_name": table_name}
+    first_id = session.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table_name, 'id'))"), params
+    ).scalar()
+    session.execute(
+        text("SELECT setval(pg_get_serial_sequence(:table_name, 'id'), :last_id)"),
+        {**params, "last_id": first_id + n - 1},
+    )
+    return np.arange(first_id, first_id + n)
+
+
+def insert_dataframe(session, table_name, df):
+    """Insert a DataFrame with multi-row INSERT statements when COPY is not available.
+
+    execute_values sends INSERT_PAGE_SIZE rows per statement instead of one
+    statement per row.
+    """
+    # Box values as Python objects and turn NaN/NaT into None (NULL)
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        execute_values(
+            cursor,
+            f"INSERT INTO {table_name} ({', '.join(df.columns)}) VALUES %s",
+            rows,
+            page_size=INSERT_PAGE_SIZE,
+        )
+    finally:
+        cursor.close()
+
+
+def load_dataframe(session, table_name, df):
+    """Load a DataFrame into a table with COPY, or multi-row INSERTs if disabled."""
+    if USE_COPY:
+        copy_dataframe(session, table_name, df)
+    else:
+        insert_dataframe(session, table_name, df)
+
+
+def drop_indexes_and_foreign_keys(session, table_name):
+    """Drop a table's secondary indexes and foreign keys, returning the SQL to restore them."""
+    # ALTER TABLE refuses to run while deferred FK checks are still queued
+    session.execute(text("SET CONSTRAINTS ALL IMMEDIATE"))
+
+    params = {"table_name": table_name}
+    foreign_keys = session.execute(
+        text("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = CAST(:table_name AS regclass) AND contype = 'f'
+            """),
+        params,
+    ).all()
+    indexes = session.execute(
+        text("""
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = CAST(:table_name AS regclass)
+              AND NOT x.indisprimary
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.oid)
+            """),
+        params,
+    ).all()
+
+    for name, _ in foreign_keys:
+        session.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{name}"'))
+    for name, _ in indexes:
+        session.execute(text(f'DROP INDEX "{name}"'))
+
+    # Indexes first so the foreign key validation can use them
+    return [definition for _, definition in indexes] + [
+        f'ALTER TABLE {table_name} ADD CONSTRAINT "{name}" {definition}'
+        for name, definition in foreign_keys
+    ]
+
+
+def restore_indexes_and_foreign_keys(session, restore_statements):
+    """Recreate indexes and foreign keys dropped by drop_indexes_and_foreign_keys."""
+    for statement in restore_statements:
+        session.execute(text(statement))
+
+
+def set_tables_logged(session, logged):
+    """Switch the populated tables between LOGGED and UNLOGGED (no WAL) storage.
+
+    PostgreSQL refuses the switch while a logged table references an unlogged
+    one, so this must run while the foreign keys are dropped.
+    """
+    mode = "LOGGED" if logged else "UNLOGGED"
+    for table_name in ("customers", "services", "purchases", "payments"):
+        session.execute(text(f"ALTER TABLE {table_name} SET {mode}"))
+
 
 def clear_database(session):
     """Clear all existing data from the database tables."""
     print("Clearing existing data...")
 
-    # Delete in reverse order to respect foreign key constraints
-    session.query(Payment).delete()
-    session.query(Purchase).delete()
-    session.query(Service).delete()
-    session.query(Customer).delete()
-    session.commit()
+    # Truncate all four tables in one statement instead of deleting row by row
+    session.execute(
+        text(
+            "TRUNCATE TABLE payments, purchases, services, customers "
+            "RESTART IDENTITY CASCADE"
+        )
+    )
 
     print("Database cleared successfully.")
 
@@ -135,282 +286,156 @@ def create_customers_bulk(session, n_customers=N_CUSTOMERS):
     """Create customers using bulk insert for maximum performance."""
     print(f"Creating {n_customers} customers using bulk insert...")
 
-    # Generate customer data using pandas for efficiency
-    customers_data = []
-    for i in range(n_customers):
-        customers_data.append(
-            {
-                "name": f"customer_{i}",
-                "email": f"customer_{i}@example.com",
-                "account_status": random.choice(list(AccountStatus)).value,
-            }
-        )
-
-        if (i + 1) % 10000 == 0:
-            print(f"Generated {i + 1} customer records...")
+    # Generate customer columns with vectorized NumPy/pandas operations
+    customer_numbers = pd.Series(np.arange(n_customers)).astype(str)
+    customers_df = pd.DataFrame(
+        {
+            "id": reserve_ids(session, "customers", n_customers),
+            "name": "customer_" + customer_numbers,
+            "email": "customer_" + customer_numbers + "@example.com",
+            "account_status": rng.choice(ACCOUNT_STATUS_VALUES, size=n_customers),
+        }
+    )
 
-    # Bulk insert customers
-    customers = [Customer(**data) for data in customers_data]
-    session.bulk_save_objects(customers)
-    session.commit()
+    # Load customers without ORM instances
+    load_dataframe(session, "customers", customers_df)
 
-    print(f"Successfully created {len(customers)} customers.")
-    return customers
+    print(f"Successfully created {len(customers_df)} customers.")
+    return customers_df["id"].to_numpy()
 
 
 def create_custom_services_bulk(session):
     """Create custom telecom services with predefined names and realistic pricing."""
     print(f"Creating {len(TELECOM_SERVICES)} custom telecom services...")
 
-    services_data = []
-    for i, service_name in enumerate(TELECOM_SERVICES):
-        # Determine service type based on name
-        if (
-            "Internet" in service_name
-            or "Fiber" in service_name
-            or "Cable" in service_name
-            or "DSL" in service_name
-            or "Wireless" in service_name
-        ):
-            service_type = ServiceType.INTERNET
-            # Higher speeds = higher prices
-            if "1Gbps" in service_name:
-                base_price = round(random.uniform(80, 120), 2)
-            elif "500Mbps" in service_name:
-                base_price = round(random.uniform(50, 80), 2)
-            elif "200Mbps" in service_name:
-                base_price = round(random.uniform(40, 60), 2)
-            elif "100Mbps" in service_name:
-                base_price = round(random.uniform(25, 45), 2)
-            elif "50Mbps" in service_name:
-                base_price = round(random.uniform(20, 35), 2)
-            else:  # 25Mbps
-                base_price = round(random.uniform(15, 25), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        elif "Mobile" in service_name:
-            service_type = ServiceType.MOBILE
-            # More data = higher prices
-            if "Unlimited" in service_name:
-                base_price = round(random.uniform(40, 60), 2)
-            elif "50GB" in service_name:
-                base_price = round(random.uniform(35, 50), 2)
-            elif "20GB" in service_name:
-                base_price = round(random.uniform(25, 35), 2)
-            elif "10GB" in service_name:
-                base_price = round(random.uniform(20, 30), 2)
-            elif "5GB" in service_name:
-                base_price = round(random.uniform(15, 25), 2)
-            else:  # Family plans
-                base_price = round(random.uniform(30, 45), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        else:  # TV services
-            service_type = ServiceType.TV
-            if "Premium" in service_name:
-                base_price = round(random.uniform(30, 50), 2)
-            elif "Sports" in service_name or "Movie" in service_name:
-                base_price = round(random.uniform(20, 35), 2)
-            else:  # Basic and Family
-                base_price = round(random.uniform(15, 25), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-
-        services_data.append(
-            {
-                "name": service_name,
-                "type": service_type.value,  # Use .value for integer
-                "base_price": base_price,
-                "is_recurring": is_recurring,
-                "billing_cycle": billing_cycle.value,  # Use .value for integer
-            }
-        )
+    # Draw every base price in one call from the per-service ranges
+    service_types, price_ranges = zip(*SERVICE_META.values())
+    lows, highs = np.array(price_ranges).T
+    services_df = pd.DataFrame(
+        {
+            "name": TELECOM_SERVICES,
+            "type": [service_type.value for service_type in service_types],
+            "base_price": np.round(rng.uniform(lows, highs), 2),
+            "is_recurring": True,
+            "billing_cycle": BillingCycle.MONTHLY.value,
+        }
+    )
+
+    # Load services
+    load_dataframe(session, "services", services_df)
 
-    # Bulk insert services
-    services = [Service(**data) for data in services_data]
-    session.bulk_save_objects(services)
-    session.commit()
+    print(f"Successfully created {len(services_df)} custom telecom services.")
+    return services_df
 
-    print(f"Successfully created {len(services)} custom telecom services.")
-    return services
 
+def create_purchases_bulk(session, customer_ids, n_purchases=N_PURCHASES):
+    """Create purchases using bulk insert with popularity-based service selection.
 
-def create_purchases_bulk(session, n_purchases=N_PURCHASES):
-    """Create purchases using bulk insert with popularity-based service selection."""
+    Returns (purchase_ids, customer_ids, base_prices) arrays for payment creation.
+    """
     print(
         f"Creating {n_purchases} purchases with popularity-based service selection..."
     )
 
-    # Get all customers and services
-    customers = session.query(Customer).all()
-    services = session.query(Service).all()
+    # Get service columns in id (creation) order to line up with
+    # SERVICE_POPULARITY_WEIGHTS
+    services = (
+        session.query(Service.id, Service.is_recurring, Service.base_price)
+        .order_by(Service.id)
+        .all()
+    )
 
-    if not customers or not services:
+    if not customer_ids.size or not services:
         raise ValueError("No customers or services available for purchase creation")
 
-    # Generate purchase data
-    purchases_data = []
-    for i in range(n_purchases):
-        # Select customer randomly
-        customer = random.choice(customers)
-
-        # Select service based on popularity weights
-        service = np.random.choice(services, p=SERVICE_POPULARITY_WEIGHTS)
-
-        # Generate dates
-        start_date = datetime.now() - timedelta(days=random.randint(1, 365))
-        end_date = start_date + timedelta(days=30) if service.is_recurring else None
+    service_ids = np.array([s.id for s in services])
+    service_is_recurring = np.array([s.is_recurring for s in services], dtype=bool)
+    service_base_prices = np.array([s.base_price for s in services])
 
-        purchases_data.append(
-            {
-                "customer_id": customer.id,
-                "service_id": service.id,
-                "start_date": start_date,
-                "end_date": end_date,
-                "status": random.choice(list(PurchaseStatus)).value,
-            }
-        )
-
-        if (i + 1) % 10000 == 0:
-            print(f"Generated {i + 1} purchase records...")
-
-    # Bulk insert purchases
-    purchases = [Purchase(**data) for data in purchases_data]
-    session.bulk_save_objects(purchases)
-    session.commit()
-
-    print(f"Successfully created {len(purchases)} purchases.")
-    return purchases
-
-
-def process_payment_batch(args):
-    """Process a single batch of payments - standalone function for multiprocessing."""
-    (
-        batch_start,
-        batch_size,
-        n_payments,
-        purchase_ids,
-        purchase_customer_ids,
-        service_base_prices,
-        customer_ids,
-    ) = args
-
-    batch_end = min(batch_start + batch_size, n_payments)
-    actual_batch_size = batch_end - batch_start
-
-    # Convert numpy arrays to regular lists for multiprocessing
-    purchase_ids = list(purchase_ids)
-    purchase_customer_ids = list(purchase_customer_ids)
-    service_base_prices = list(service_base_prices)
-    customer_ids = list(customer_ids)
-
-    # Randomly select purchase indices
-    purchase_indices = np.random.choice(
-        len(purchase_ids), size=actual_batch_size, replace=True
-    )
-    selected_purchase_ids = [purchase_ids[i] for i in purchase_indices]
-    selected_customer_ids = [purchase_customer_ids[i] for i in purchase_indices]
-    selected_base_prices = [service_base_prices[i] for i in purchase_indices]
-
-    # Decide whether to use same customer (95%) or different customer (5%)
-    same_customer_mask = np.random.random(actual_batch_size) < 0.95
-    payment_customer_ids = []
-    for i, same_customer in enumerate(same_customer_mask):
-        if same_customer:
-            payment_customer_ids.append(selected_customer_ids[i])
-        else:
-            payment_customer_ids.append(random.choice(customer_ids))
-
-    # Generate other fields
-    timestamps = [
-        datetime.now() - timedelta(days=random.randint(1, 365))
-        for _ in range(actual_batch_size)
-    ]
-    currencies = np.random.choice([c.value for c in Currency], size=actual_batch_size)
-    payment_methods = np.random.choice(
-        [m.value for m in PaymentMethod], size=actual_batch_size
+    # Draw every column for all purchases in one vectorized call each
+    service_idx = np.searchsorted(
+        SERVICE_POPULARITY_CDF, rng.random(n_purchases), side="right"
     )
-    statuses = np.random.choice(
-        [s.value for s in PaymentStatus], size=actual_batch_size
+    start_dates = np.datetime64(datetime.now(), "us") - rng.integers(
+        1, 366, size=n_purchases
+    ).astype("timedelta64[D]")
+    end_dates = np.where(
+        service_is_recurring[service_idx],
+        start_dates + np.timedelta64(30, "D"),
+        np.datetime64("NaT"),
     )
-
-    return [
+    purchases_df = pd.DataFrame(
         {
-            "customer_id": int(payment_customer_ids[i]),
-            "purchase_id": int(selected_purchase_ids[i]),
-            "amount": float(selected_base_prices[i]),
-            "currency": int(currencies[i]),
-            "payment_method": int(payment_methods[i]),
-            "status": int(statuses[i]),
-            "timestamp": timestamps[i],
+            "id": reserve_ids(session, "purchases", n_purchases),
+            "customer_id": rng.choice(customer_ids, size=n_purchases),
+            "service_id": service_ids[service_idx],
+            "start_date": start_dates,
+            "end_date": end_dates,
+            "status": rng.choice(PURCHASE_STATUS_VALUES, size=n_purchases),
         }
-        for i in range(actual_batch_size)
-    ]
-
+    )
 
-def create_payments_bulk(session, n_payments=N_PAYMENTS, batch_size=10000):
-    """Create payments using optimized bulk insert with batching and parallelism."""
-    print(f"Creating {n_payments} payments with batching and parallelism...")
+    # Load purchases; NaT end dates become NULL
+    load_dataframe(session, "purchases", purchases_df)
 
-    # Fetch customer IDs and purchase-service pairs in chunks
-    customer_ids = [c.id for c in session.query(Customer.id).yield_per(1000)]
-    purchase_service_query = (
-        session.query(Purchase.id, Purchase.customer_id, Service.base_price)
-        .join(Service, Purchase.service_id == Service.id)
-        .yield_per(1000)
+    print(f"Successfully created {len(purchases_df)} purchases.")
+    return (
+        purchases_df["id"].to_numpy(),
+        purchases_df["customer_id"].to_numpy(),
+        service_base_prices[service_idx],
     )
-    purchase_service_data = [
-        (p.id, p.customer_id, p.base_price) for p in purchase_service_query
-    ]
-    purchase_ids = [p[0] for p in purchase_service_data]
-    purchase_customer_ids = [p[1] for p in purchase_service_data]
-    service_base_prices = [p[2] for p in purchase_service_data]
 
-    if not customer_ids or not purchase_ids:
+
+def create_payments_bulk(
+    session, customer_ids, purchase_arrays, n_payments=N_PAYMENTS, batch_size=100_000
+):
+    """Create payments using vectorized NumPy generation, loaded batch by batch.
+
+    purchase_arrays is the (purchase_ids, customer_ids, base_prices) tuple
+    returned by create_purchases_bulk, so nothing is read back from the
+    database. Each batch is generated, loaded and dropped before the next,
+    so memory stays bounded by one batch.
+    """
+    print(f"Creating {n_payments} payments...")
+
+    purchase_ids, purchase_customer_ids, service_base_prices = purchase_arrays
+
+    if not customer_ids.size or not purchase_ids.size:
         raise ValueError("No customers or purchases available for payment creation")
 
-    # Prepare arguments for parallel processing
-    batch_starts = list(range(0, n_payments, batch_size))
-    process_args = [
-        (
-            batch_start,
-            batch_size,
-            n_payments,
-            purchase_ids,
-            purchase_customer_ids,
-            service_base_prices,
-            customer_ids,
+    now = np.datetime64(datetime.now(), "us")
+    for batch_start in range(0, n_payments, batch_size):
+        n_batch = min(batch_size, n_payments - batch_start)
+
+        # Randomly select a purchase for every payment in the batch at once
+        purchase_idx = rng.integers(0, len(purchase_ids), size=n_batch)
+
+        # Use the purchase customer (95%) or a random customer (5%)
+        payment_customer_ids = purchase_customer_ids[purchase_idx]
+        different_customer = rng.random(n_batch) >= 0.95
+        payment_customer_ids[different_customer] = rng.choice(
+            customer_ids, size=different_customer.sum()
         )
-        for batch_start in batch_starts
-    ]
 
-    # Parallelize payment data generation
-    payment_data = []
-    with ProcessPoolExecutor() as executor:
-        batches = executor.map(process_payment_batch, process_args)
-        for i, batch in enumerate(batches):
-            payment_data.extend(batch)
-            print(f"Generated {(i + 1) * batch_size:,} payment records...")
-
-    # Use raw SQL for bulk insert (example for PostgreSQL)
-    def insert_batch(batch):
-        session.execute(
-            text("""
-                INSERT INTO payments (customer_id, purchase_id, amount, currency, payment_method, status, timestamp)
-                VALUES (:customer_id, :purchase_id, :amount, :currency, :payment_method, :status, :timestamp)
-            """),
-            batch,  # batch is already a list of dicts
+        payments_df = pd.DataFrame(
+            {
+                "customer_id": payment_customer_ids,
+                "purchase_id": purchase_ids[purchase_idx],
+                "amount": service_base_prices[purchase_idx],
+                "currency": rng.choice(CURRENCY_VALUES, size=n_batch),
+                "payment_method": rng.choice(PAYMENT_METHOD_VALUES, size=n_batch),
+                "status": rng.choice(PAYMENT_STATUS_VALUES, size=n_batch),
+                "timestamp": now
+                - rng.integers(1, 366, size=n_batch).astype("timedelta64[D]"),
+            }
         )
 
-    # Insert payments in batches
-    for i in range(0, len(payment_data), batch_size):
-        batch = payment_data[i : i + batch_size]
-        insert_batch(batch)
-        session.commit()
-        print(f"Inserted {min((i + batch_size), n_payments):,} payments...")
+        # One COPY per batch instead of row-wise INSERTs
+        load_dataframe(session, "payments", payments_df)
+        print(f"Inserted {batch_start + n_batch:,} payments...")
 
-    print(f"Successfully created {len(payment_data)} payments.")
-    return payment_data
+    print(f"Successfully created {n_payments} payments.")
+    return n_payments
 
 
 def print_statistics(session):
@@ -433,12 +458,16 @@ def print_statistics(session):
     # Service popularity statistics
     print("\nService Popularity Statistics:")
     print("-" * 50)
-    services = session.query(Service).all()
-    total_purchases = session.query(Purchase).count()
+    # One GROUP BY query for all per-service counts
+    purchase_counts = dict(
+        session.query(Purchase.service_id, func.count())
+        .group_by(Purchase.service_id)
+        .all()
+    )
+    total_purchases = sum(purchase_counts.values())
+    services = session.query(Service.id, Service.name).all()
     for service in services:
-        purchase_count = (
-            session.query(Purchase).filter(Purchase.service_id == service.id).count()
-        )
+        purchase_count = purchase_counts.get(service.id, 0)
         popularity_percentage = (
             (purchase_count / total_purchases) * 100 if total_purchases > 0 else 0
         )
@@ -449,27 +478,31 @@ def print_statistics(session):
     # Payment verification
     print("\nPayment Verification:")
     print("-" * 50)
-    total_payments = session.query(Payment).count()
-    correct_amounts = 0
-    matching_customers = 0
-
-    # Sample verification (check first 1000 payments for performance)
-    sample_payments = session.query(Payment).limit(1000).all()
-    for payment in sample_payments:
-        # Get purchase and service
-        purchase = (
-            session.query(Purchase).filter(Purchase.id == payment.purchase_id).first()
+    # Sample verification (check first 1000 payments for performance): fetch
+    # only the compared columns in one JOIN and compare them in pandas
+    sample_query = (
+        session.query(
+            Payment.amount,
+            Payment.customer_id,
+            Purchase.customer_id.label("purchase_customer_id"),
+            Service.base_price,
         )
-        if purchase:
-            service = (
-                session.query(Service).filter(Service.id == purchase.service_id).first()
-            )
-            if service and abs(payment.amount - service.base_price) < 0.01:
-                correct_amounts += 1
-            if payment.customer_id == purchase.customer_id:
-                matching_customers += 1
-
-    sample_size = len(sample_payments)
+        .join(Purchase, Payment.purchase_id == Purchase.id)
+        .join(Service, Purchase.service_id == Service.id)
+        .limit(1000)
+    )
+    sample_df = pd.DataFrame(
+        sample_query.all(),
+        columns=["amount", "customer_id", "purchase_customer_id", "base_price"],
+    )
+    correct_amounts = int(
+        ((sample_df["amount"] - sample_df["base_price"]).abs() < 0.01).sum()
+    )
+    matching_customers = int(
+        (sample_df["customer_id"] == sample_df["purchase_customer_id"]).sum()
+    )
+
+    sample_size = len(sample_df)
     amount_accuracy = (correct_amounts / sample_size) * 100 if sample_size > 0 else 0
     customer_accuracy = (
         (matching_customers / sample_size) * 100 if sample_size > 0 else 0
@@ -486,6 +519,17 @@ def print_statistics(session):
 
 def main():
     """Main function to populate the database using SQLAlchemy."""
+    parser = argparse.ArgumentParser(
+        description="Populate the payments database using SQLAlchemy."
+    )
+    parser.add_argument(
+        "--unlogged",
+        action="store_true",
+        help="load into UNLOGGED tables and switch them back to LOGGED afterwards "
+        "(skips WAL during the load; meant for dev seeding)",
+    )
+    unlogged = parser.parse_args().unlogged
+
     start_time = datetime.now()
     print("Starting high-performance database population with SQLAlchemy...")
     print("=" * 60)
@@ -494,17 +538,40 @@ def main():
 
     session = None
     try:
-        # Get SQLAlchemy session
-        session = get_session()
+        # Get SQLAlchemy session on the loader engine
+        session = SessionLocal(bind=load_engine)
+
+        # Run the whole population as one transaction that commits once;
+        # SET LOCAL skips waiting for the WAL flush on that commit
+        session.execute(text("SET LOCAL synchronous_commit = OFF"))
+
+        # Load purchases and payments without per-row index and FK
+        # maintenance, then build each index once afterwards
+        print("Dropping purchase and payment indexes and foreign keys...")
+        restore_statements = []
+        for table_name in ("purchases", "payments"):
+            restore_statements += drop_indexes_and_foreign_keys(session, table_name)
+
+        if unlogged:
+            print("Switching tables to UNLOGGED for the load...")
+            set_tables_logged(session, False)
 
         # Clear existing data
         clear_database(session)
 
         # Create data using bulk operations
-        customers = create_customers_bulk(session)
+        customer_ids = create_customers_bulk(session)
         services = create_custom_services_bulk(session)
-        purchases = create_purchases_bulk(session)
-        payments = create_payments_bulk(session)
+        purchase_arrays = create_purchases_bulk(session, customer_ids)
+        payments = create_payments_bulk(session, customer_ids, purchase_arrays)
+
+        if unlogged:
+            print("Switching tables back to LOGGED...")
+            set_tables_logged(session, True)
+
+        print("Recreating purchase and payment indexes and foreign keys...")
+        restore_indexes_and_foreign_keys(session, restore_statements)
+        session.commit()
 
         # Calculate end time and elapsed time
         end_time = datetime.now()
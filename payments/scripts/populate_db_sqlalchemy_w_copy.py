@@ -9,19 +9,32 @@ This script populates the main database with (see constants below for numbers):
 - payments (using existing customers and purchases)
 
 It uses SQLAlchemy with bulk operations for maximum performance.
+
+Pass --server-side to generate purchases and payments in PostgreSQL with
+INSERT ... SELECT over generate_series instead of NumPy workers and COPY.
 """
 
+import argparse
 import io
+import itertools
+import multiprocessing
 import os
-import random
+import queue
+import struct
 import sys
-from concurrent.futures import ProcessPoolExecutor
-from datetime import datetime, timedelta
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from datetime import datetime
+from multiprocessing import shared_memory
 
 import numpy as np
-from faker import Faker
-
-# from sqlalchemy.orm import joinedload
+from sqlalchemy import func
 from sqlalchemy.sql import text
 
 # Add the project root to the Python path
@@ -45,9 +58,6 @@ from payments.sqlalchemy_models import (
     ServiceType,
 )
 
-# Initialize Faker
-fake = Faker()
-
 # Constants high performance
 N_CUSTOMERS = 10_000_000
 N_SERVICES = 20
@@ -66,32 +76,86 @@ N_PAYMENTS = 10_000_000
 # N_PURCHASES = 20_000
 # N_PAYMENTS = 20_000
 
-# Custom telecom service names
-TELECOM_SERVICES = [
-    # Internet Services
-    "Fiber Optic 100Mbps",
-    "Fiber Optic 500Mbps",
-    "Fiber Optic 1Gbps",
-    "Cable Internet 50Mbps",
-    "Cable Internet 200Mbps",
-    "DSL Internet 25Mbps",
-    "DSL Internet 50Mbps",
-    "Wireless Internet 100Mbps",
-    # Mobile Services
-    "Mobile Plan 5GB",
-    "Mobile Plan 10GB",
-    "Mobile Plan 20GB",
-    "Mobile Plan Unlimited",
-    "Mobile Plan Family 4GB",
-    "Mobile Plan Family 10GB",
-    "Mobile Plan Business 50GB",
-    # TV Services
-    "Basic TV Package",
-    "Premium TV Package",
-    "Sports TV Package",
-    "Movie TV Package",
-    "Family TV Package",
-]
+# Column names and PostgreSQL binary types of the COPY data for each table
+SERVICE_COLUMNS = {
+    "name": "text",
+    "type": "int4",
+    "base_price": "float8",
+    "is_recurring": "bool",
+    "billing_cycle": "int4",
+}
+PURCHASE_COLUMNS = {
+    "customer_id": "int8",
+    "service_id": "int8",
+    "start_date": "timestamptz",
+    "end_date": "timestamptz",
+    "status": "int4",
+}
+PAYMENT_COLUMNS = {
+    "customer_id": "int8",
+    "purchase_id": "int8",
+    "amount": "float8",
+    "currency": "int4",
+    "payment_method": "int4",
+    "status": "int4",
+    "timestamp": "timestamptz",
+}
+
+# Generated batches submitted to the worker pool at any one time
+MAX_BATCHES_IN_FLIGHT = 2 * (os.cpu_count() or 1)
+
+# Start generator workers from a clean forkserver process rather than forking
+# this one, which by then runs the COPY threads and holds open connections
+WORKER_CONTEXT = multiprocessing.get_context("forkserver")
+
+# Concurrent COPY streams per table; PostgreSQL accepts parallel COPY into the
+# same table, and more writers than this rarely help
+COPY_CONNECTIONS = min(os.cpu_count() or 1, 8)
+
+# COPY ... WITH (FORMAT BINARY) framing: signature, flags and header extension
+# length, then per row an int16 field count and per field an int32 byte
+# length (-1 for NULL) followed by the big-endian value
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack(">h", -1)
+COPY_BINARY_DTYPES = {
+    "int4": ">i4",
+    "int8": ">i8",
+    "float8": ">f8",
+    "bool": "?",
+    "timestamptz": ">i8",
+}
+
+# PostgreSQL timestamps count microseconds from 2000-01-01 UTC
+PG_EPOCH_US = 946_684_800 * 1_000_000
+DAY_US = 86_400 * 1_000_000
+
+# Custom telecom services with their type and base price range
+SERVICE_META = {
+    # Internet: higher speeds = higher prices
+    "Fiber Optic 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    "Fiber Optic 500Mbps": (ServiceType.INTERNET, (50, 80)),
+    "Fiber Optic 1Gbps": (ServiceType.INTERNET, (80, 120)),
+    "Cable Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Cable Internet 200Mbps": (ServiceType.INTERNET, (40, 60)),
+    "DSL Internet 25Mbps": (ServiceType.INTERNET, (15, 25)),
+    "DSL Internet 50Mbps": (ServiceType.INTERNET, (20, 35)),
+    "Wireless Internet 100Mbps": (ServiceType.INTERNET, (25, 45)),
+    # Mobile: more data = higher prices
+    "Mobile Plan 5GB": (ServiceType.MOBILE, (15, 25)),
+    "Mobile Plan 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan 20GB": (ServiceType.MOBILE, (25, 35)),
+    "Mobile Plan Unlimited": (ServiceType.MOBILE, (40, 60)),
+    "Mobile Plan Family 4GB": (ServiceType.MOBILE, (30, 45)),
+    "Mobile Plan Family 10GB": (ServiceType.MOBILE, (20, 30)),
+    "Mobile Plan Business 50GB": (ServiceType.MOBILE, (35, 50)),
+    # TV
+    "Basic TV Package": (ServiceType.TV, (15, 25)),
+    "Premium TV Package": (ServiceType.TV, (30, 50)),
+    "Sports TV Package": (ServiceType.TV, (20, 35)),
+    "Movie TV Package": (ServiceType.TV, (20, 35)),
+    "Family TV Package": (ServiceType.TV, (15, 25)),
+}
+TELECOM_SERVICES = list(SERVICE_META)
 
 # Service popularity weights (higher = more popular)
 SERVICE_POPULARITY_WEIGHTS = [
@@ -123,34 +187,367 @@ SERVICE_POPULARITY_WEIGHTS = (
     SERVICE_POPULARITY_WEIGHTS / SERVICE_POPULARITY_WEIGHTS.sum()
 )
 
+# Cumulative weights for inverse-CDF sampling with searchsorted; pin the last
+# entry so rounding can never leave a uniform draw past the end
+SERVICE_CDF = np.cumsum(SERVICE_POPULARITY_WEIGHTS)
+SERVICE_CDF[-1] = 1.0
+
+# Enum values to sample generated columns from, built once per process
+# instead of once per batch
+PURCHASE_STATUS_VALUES = np.array([e.value for e in PurchaseStatus], dtype=np.int32)
+CURRENCY_VALUES = np.array([e.value for e in Currency], dtype=np.int32)
+PAYMENT_METHOD_VALUES = np.array([e.value for e in PaymentMethod], dtype=np.int32)
+PAYMENT_STATUS_VALUES = np.array([e.value for e in PaymentStatus], dtype=np.int32)
+
+
+def format_copy_columns(columns, values, nulls=None):
+    """Encode column arrays as PostgreSQL binary COPY data.
+
+    columns maps each column to its type and values maps it to a NumPy
+    array; timestamps are Unix microseconds and nulls optionally maps a column to
+    a boolean NULL mask. Rows whose fields have the same byte lengths share
+    one record layout, so each such group is packed as a structured array
+    and scattered to its rows' byte offsets in a single preallocated output
+    buffer instead of packing values one by one. Rows keep their input
+    order, so serial ids follow the order of the values.
+    """
+    nulls = nulls or {}
+    arrays = {}
+    n_rows = len(next(iter(values.values())))
+    lengths = np.empty((n_rows, len(columns)), dtype=np.int32)
+    for i, (column, column_type) in enumerate(columns.items()):
+        array = np.asarray(values[column])
+        if column_type == "text":
+            if array.dtype.kind == "U":
+                array = np.char.encode(array, "utf-8")
+            lengths[:, i] = np.char.str_len(array)
+        else:
+            if column_type == "timestamptz":
+                array = array - PG_EPOCH_US
+            lengths[:, i] = np.dtype(COPY_BINARY_DTYPES[column_type]).itemsize
+        if column in nulls:
+            lengths[nulls[column], i] = -1
+        if column_type == "int4" and array.dtype.kind in "iu" and array.size:
+            # NumPy would wrap out-of-range values when narrowing to 4 bytes
+            present = array[lengths[:, i] >= 0]
+            limits = np.iinfo(np.int32)
+            if present.size and (
+                present.min() < limits.min or present.max() > limits.max
+            ):
+                raise ValueError(f"Column {column} has values outside int4 range")
+        arrays[column] = array
+
+    # Each row is its field count, then a length word and the value bytes per
+    # field; the running total of row sizes gives every row's byte offset
+    row_sizes = 2 + (4 * len(columns)) + np.maximum(lengths, 0).sum(axis=1)
+    row_offsets = len(COPY_BINARY_HEADER) + np.cumsum(row_sizes) - row_sizes
+    body_size = int(row_sizes.sum())
+
+    output = np.empty(
+        len(COPY_BINARY_HEADER) + body_size + len(COPY_BINARY_TRAILER),
+        dtype=np.uint8,
+    )
+    output[: len(COPY_BINARY_HEADER)] = np.frombuffer(COPY_BINARY_HEADER, np.uint8)
+
+    layouts, layout_index = np.unique(lengths, axis=0, return_inverse=True)
+    layout_index = layout_index.ravel()
+    for i, layout in enumerate(layouts):
+        rows = layout_index == i
+        fields = [("field_count", ">i2")]
+        for (column, column_type), length in zip(columns.items(), layout):
+            fields.append((f"{column}_length", ">i4"))
+            if length >= 0:
+                dtype = (
+                    f"S{length}"
+                    if column_type == "text"
+                    else COPY_BINARY_DTYPES[column_type]
+                )
+                fields.append((column, dtype))
+        dtype = np.dtype(fields)
+
+        # A group whose rows are contiguous (always so with a single layout)
+        # is filled in place; interleaved groups are packed separately and
+        # scattered to their rows' offsets
+        row_indices = np.flatnonzero(rows)
+        contiguous = row_indices[-1] - row_indices[0] + 1 == len(row_indices)
+        if contiguous:
+            start = row_offsets[row_indices[0]]
+            records = output[start : start + len(row_indices) * dtype.itemsize].view(
+                dtype
+            )
+        else:
+            records = np.empty(len(row_indices), dtype=dtype)
+        records["field_count"] = len(columns)
+        for column, length in zip(columns, layout):
+            records[f"{column}_length"] = length
+            if length >= 0:
+                records[column] = arrays[column][rows]
+        if not contiguous:
+            positions = row_offsets[row_indices][:, None] + np.arange(dtype.itemsize)
+            output[positions] = records.view(np.uint8).reshape(-1, dtype.itemsize)
+
+    output[len(COPY_BINARY_HEADER) + body_size :] = np.frombuffer(
+        COPY_BINARY_TRAILER, np.uint8
+    )
+    return output.tobytes()
+
+
+def fetch_copy_columns(session, query, columns):
+    """Read a query result into NumPy arrays with binary COPY TO STDOUT.
+
+    columns maps each selected column to its type. They must all be
+    fixed-width and non-NULL, so every row shares one layout and the whole
+    COPY body can be viewed as a single structured array without creating
+    a Python object per value.
+    """
+    buffer = io.BytesIO()
+    cursor = session.connection().connection.cursor()
+    cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT binary)", buffer)
+    cursor.close()
 
-def insert_batch_copy(batch, session, table_name):
-    """Use PostgreSQL COPY command for ultra-fast bulk inserts."""
-    if not batch:
+    fields = [("field_count", ">i2")]
+    for column, column_type in columns.items():
+        fields.append((f"{column}_length", ">i4"))
+        fields.append((column, COPY_BINARY_DTYPES[column_type]))
+    data = buffer.getbuffer()
+    records = np.frombuffer(
+        data[len(COPY_BINARY_HEADER) : len(data) - len(COPY_BINARY_TRAILER)],
+        dtype=fields,
+    )
+    return {
+        column: records[column].astype(records.dtype[column].newbyteorder("="))
+        for column in columns
+    }
+
+
+@contextmanager
+def copy_cursor(session):
+    """Yield a cursor on the session's connection for loading one table.
+
+    All batches of the table go through this cursor in a single transaction
+    with synchronous_commit off, committed once when the block exits
+    cleanly instead of checking out a connection and committing per batch.
+    """
+    session.execute(text("SET LOCAL synchronous_commit = off"))
+    cursor = session.connection().connection.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+    session.commit()
+
+
+def copy_rows(cursor, table_name, columns, data):
+    """Use PostgreSQL COPY command to stream pre-encoded rows into a table."""
+    if not data:
         return
 
-    output = io.StringIO()
-    for row in batch:
-        # Convert values to strings, handling None/NULL values
-        values = []
-        for value in row.values():
-            if value is None:
-                values.append("\\N")  # PostgreSQL NULL representation
-            elif isinstance(value, datetime):
-                values.append(value.isoformat())
-            else:
-                values.append(str(value))
-        output.write("\t".join(values) + "\n")
-    output.seek(0)
-
-    conn = session.connection().engine.raw_connection()
-    cursor = conn.cursor()
-    cursor.copy_from(
-        output, table_name, sep="\t", columns=list(batch[0].keys()), null="\\N"
+    cursor.copy_expert(
+        f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT binary)",
+        io.BytesIO(data),
     )
-    conn.commit()
-    cursor.close()
-    conn.close()
+
+
+def generate_batches(executor, worker, process_args):
+    """Yield (args, result) for each batch as soon as a worker finishes it.
+
+    Unlike executor.map, only MAX_BATCHES_IN_FLIGHT batches are submitted at
+    a time, so memory stays bounded by the pool size rather than the number
+    of batches, and one slow batch does not hold back the ones after it.
+    """
+    pending_args = iter(process_args)
+    in_flight = {
+        executor.submit(worker, args): args
+        for args in itertools.islice(pending_args, MAX_BATCHES_IN_FLIGHT)
+    }
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            args = in_flight.pop(future)
+            for next_args in itertools.islice(pending_args, 1):
+                in_flight[executor.submit(worker, next_args)] = next_args
+            yield args, future.result()
+
+
+def copy_stream(engine, table_name, columns, batches, aborted):
+    """Stream the batches of one queue into a table over its own connection.
+
+    Runs until it receives None, then commits unless the load was aborted.
+    """
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        for data in iter(batches.get, None):
+            copy_rows(cursor, table_name, columns, data)
+        cursor.close()
+        if aborted.is_set():
+            conn.rollback()
+        else:
+            conn.commit()
+    finally:
+        conn.close()
+
+
+def offer(batches, stream, item):
+    """Put item on a stream's queue, giving up if the stream has stopped."""
+    while not stream.done():
+        try:
+            batches.put(item, timeout=1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+@contextmanager
+def parallel_copy(engine, table_name, columns, n_connections=COPY_CONNECTIONS):
+    """Yield a function dealing encoded batches round-robin to COPY streams.
+
+    Each stream runs copy_stream in its own thread and commits on its own
+    when the block exits cleanly; if the block raises, all of them roll
+    back. The queues are bounded so generated batches cannot pile up ahead
+    of the slowest stream.
+    """
+    aborted = threading.Event()
+    queues = [queue.Queue(maxsize=2) for _ in range(n_connections)]
+    with ThreadPoolExecutor(max_workers=n_connections) as executor:
+        streams = [
+            executor.submit(copy_stream, engine, table_name, columns, batches, aborted)
+            for batches in queues
+        ]
+        targets = itertools.cycle(zip(queues, streams))
+
+        def deal(data):
+            batches, stream = next(targets)
+            if not offer(batches, stream, data):
+                # A stream only stops early when it failed
+                stream.result()
+
+        try:
+            yield deal
+        except BaseException:
+            aborted.set()
+            raise
+        finally:
+            for batches, stream in zip(queues, streams):
+                offer(batches, stream, None)
+
+    for stream in streams:
+        stream.result()
+
+
+@contextmanager
+def shared_arrays(**arrays):
+    """Copy arrays into shared memory for the duration of the block.
+
+    Yields a (name, shape, dtype) spec per array for attach_shared_arrays, so
+    the pool workers map the data once instead of unpickling it per task.
+    """
+    blocks = []
+    specs = {}
+    try:
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[:] = array
+            specs[key] = (block.name, array.shape, array.dtype.str)
+        yield specs
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+# Shared arrays mapped into a worker process by attach_shared_arrays; the
+# blocks are kept referenced so their buffers outlive the initializer
+_SHARED_BLOCKS = []
+_SHARED_ARRAYS = {}
+
+
+def attach_shared_arrays(specs):
+    """Pool initializer binding the arrays created by shared_arrays."""
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _SHARED_BLOCKS.append(block)
+        _SHARED_ARRAYS[key] = np.ndarray(shape, dtype, buffer=block.buf)
+
+
+def drop_indexes_and_foreign_keys(session, table_name):
+    """Drop a table's secondary indexes and foreign keys.
+
+    Returns the index definitions and (table, name, definition) foreign keys
+    for restore_indexes_and_foreign_keys.
+    """
+    params = {"table_name": table_name}
+    foreign_keys = session.execute(
+        text("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = CAST(:table_name AS regclass) AND contype = 'f'
+            """),
+        params,
+    ).all()
+    indexes = session.execute(
+        text("""
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = CAST(:table_name AS regclass)
+              AND NOT x.indisprimary
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.oid)
+            """),
+        params,
+    ).all()
+
+    for name, _ in foreign_keys:
+        session.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{name}"'))
+    for name, _ in indexes:
+        session.execute(text(f'DROP INDEX "{name}"'))
+
+    return [definition for _, definition in indexes], [
+        (table_name, name, definition) for name, definition in foreign_keys
+    ]
+
+
+def restore_indexes_and_foreign_keys(engine, index_definitions, foreign_keys):
+    """Recreate indexes and foreign keys dropped by drop_indexes_and_foreign_keys.
+
+    Indexes are built in parallel on separate connections (plain CREATE
+    INDEX only takes a SHARE lock, so builds on one table do not block each
+    other). Foreign keys are then added NOT VALID and validated afterwards,
+    so the row check runs under the weaker VALIDATE CONSTRAINT lock.
+    """
+
+    def create_index(definition):
+        with engine.begin() as conn:
+            conn.execute(text(definition))
+
+    if index_definitions:
+        with ThreadPoolExecutor(max_workers=COPY_CONNECTIONS) as executor:
+            list(executor.map(create_index, index_definitions))
+
+    with engine.begin() as conn:
+        for table_name, name, definition in foreign_keys:
+            conn.execute(
+                text(
+                    f'ALTER TABLE {table_name} ADD CONSTRAINT "{name}" {definition} NOT VALID'
+                )
+            )
+    with engine.begin() as conn:
+        for table_name, name, _ in foreign_keys:
+            conn.execute(text(f'ALTER TABLE {table_name} VALIDATE CONSTRAINT "{name}"'))
+
+
+def set_tables_logged(session, table_names, logged):
+    """Switch tables between LOGGED and UNLOGGED (no WAL) storage.
+
+    PostgreSQL refuses the switch while a logged table references an unlogged
+    one, so this must run while the foreign keys are dropped.
+    """
+    mode = "LOGGED" if logged else "UNLOGGED"
+    for table_name in table_names:
+        session.execute(text(f"ALTER TABLE {table_name} SET {mode}"))
 
 
 def clear_database(session):
@@ -165,354 +562,373 @@ def clear_database(session):
     print("Database cleared successfully.")
 
 
-def process_customer_batch(args):
-    """Process a single batch of customers - standalone function for multiprocessing."""
-    batch_start, batch_size, n_customers, account_status_values = args
-    batch_end = min(batch_start + batch_size, n_customers)
-    actual_batch_size = batch_end - batch_start
-    customers_data = []
-    for i in range(batch_start, batch_end):
-        customers_data.append(
-            {
-                "name": f"customer_{i}",
-                "email": f"customer_{i}@example.com",
-                "account_status": random.choice(account_status_values),
-            }
-        )
-    return customers_data
+def random_choice_sql(values):
+    """SQL expression picking one of the given integers per row with random()."""
+    return f"(ARRAY{list(values)})[1 + floor(random() * {len(values)})::int]"
 
 
-def create_customers_bulk(session, n_customers=N_CUSTOMERS, batch_size=10000):
-    """Create customers using optimized bulk insert with batching and parallelism."""
-    print(f"Creating {n_customers} customers with batching and parallelism...")
+def create_customers_bulk(session, n_customers=N_CUSTOMERS):
+    """Create placeholder customers entirely in PostgreSQL with generate_series.
 
-    account_status_values = [s.value for s in AccountStatus]
-    batch_starts = list(range(0, n_customers, batch_size))
-    process_args = [
-        (batch_start, batch_size, n_customers, account_status_values)
-        for batch_start in batch_starts
-    ]
+    Names and emails only encode the row number, so there is nothing to
+    generate client-side or send over the wire.
+    """
+    print(f"Creating {n_customers} customers server-side...")
 
-    customers_data = []
-    with ProcessPoolExecutor() as executor:
-        batches = executor.map(process_customer_batch, process_args)
-        for i, batch in enumerate(batches):
-            customers_data.extend(batch)
-            print(f"Generated {(i + 1) * batch_size:,} customer records...")
-
-    print("Inserting customers using PostgreSQL COPY command...")
-    for i in range(0, len(customers_data), batch_size):
-        batch = customers_data[i : i + batch_size]
-        insert_batch_copy(batch, session, "customers")
-        print(f"Inserted {min((i + batch_size), n_customers):,} customers...")
+    session.execute(text("SET LOCAL synchronous_commit = off"))
+    created = session.execute(
+        text(f"""
+            INSERT INTO customers (name, email, account_status)
+            SELECT 'customer_' || g, 'customer_' || g || '@example.com',
+                   {random_choice_sql([e.value for e in AccountStatus])}
+            FROM generate_series(0, :n_customers - 1) AS g
+            """),
+        {"n_customers": n_customers},
+    ).rowcount
+    session.commit()
 
-    print(f"Successfully created {len(customers_data)} customers.")
-    return customers_data
+    print(f"Successfully created {created} customers.")
+    return created
 
 
 def create_custom_services_bulk(session):
     """Create custom telecom services with predefined names and realistic pricing."""
     print(f"Creating {len(TELECOM_SERVICES)} custom telecom services...")
 
-    services_data = []
-    for i, service_name in enumerate(TELECOM_SERVICES):
-        # Determine service type based on name
-        if (
-            "Internet" in service_name
-            or "Fiber" in service_name
-            or "Cable" in service_name
-            or "DSL" in service_name
-            or "Wireless" in service_name
-        ):
-            service_type = ServiceType.INTERNET
-            # Higher speeds = higher prices
-            if "1Gbps" in service_name:
-                base_price = round(random.uniform(80, 120), 2)
-            elif "500Mbps" in service_name:
-                base_price = round(random.uniform(50, 80), 2)
-            elif "200Mbps" in service_name:
-                base_price = round(random.uniform(40, 60), 2)
-            elif "100Mbps" in service_name:
-                base_price = round(random.uniform(25, 45), 2)
-            elif "50Mbps" in service_name:
-                base_price = round(random.uniform(20, 35), 2)
-            else:  # 25Mbps
-                base_price = round(random.uniform(15, 25), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        elif "Mobile" in service_name:
-            service_type = ServiceType.MOBILE
-            # More data = higher prices
-            if "Unlimited" in service_name:
-                base_price = round(random.uniform(40, 60), 2)
-            elif "50GB" in service_name:
-                base_price = round(random.uniform(35, 50), 2)
-            elif "20GB" in service_name:
-                base_price = round(random.uniform(25, 35), 2)
-            elif "10GB" in service_name:
-                base_price = round(random.uniform(20, 30), 2)
-            elif "5GB" in service_name:
-                base_price = round(random.uniform(15, 25), 2)
-            else:  # Family plans
-                base_price = round(random.uniform(30, 45), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-        else:  # TV services
-            service_type = ServiceType.TV
-            if "Premium" in service_name:
-                base_price = round(random.uniform(30, 50), 2)
-            elif "Sports" in service_name or "Movie" in service_name:
-                base_price = round(random.uniform(20, 35), 2)
-            else:  # Basic and Family
-                base_price = round(random.uniform(15, 25), 2)
-            is_recurring = True
-            billing_cycle = BillingCycle.MONTHLY
-
-        services_data.append(
-            {
-                "name": service_name,
-                "type": service_type.value,  # Use .value for integer
-                "base_price": base_price,
-                "is_recurring": is_recurring,
-                "billing_cycle": billing_cycle.value,  # Use .value for integer
-            }
-        )
+    # Draw every base price in one call from the per-service ranges
+    service_types, price_ranges = zip(*SERVICE_META.values())
+    lows, highs = np.array(price_ranges).T
+    n_services = len(TELECOM_SERVICES)
+    services_data = {
+        "name": np.array(TELECOM_SERVICES),
+        "type": np.array([service_type.value for service_type in service_types]),
+        "base_price": np.round(np.random.uniform(lows, highs), 2),
+        "is_recurring": np.ones(n_services, dtype=bool),
+        "billing_cycle": np.full(n_services, BillingCycle.MONTHLY.value),
+    }
 
     # Use PostgreSQL COPY command for ultra-fast bulk insert
     print("Inserting services using PostgreSQL COPY command...")
-    insert_batch_copy(services_data, session, "services")
+    with copy_cursor(session) as cursor:
+        copy_rows(
+            cursor,
+            "services",
+            SERVICE_COLUMNS,
+            format_copy_columns(SERVICE_COLUMNS, services_data),
+        )
 
-    print(f"Successfully created {len(services_data)} custom telecom services.")
+    print(f"Successfully created {n_services} custom telecom services.")
     return services_data
 
 
+def fetch_services_by_popularity(session):
+    """Return service ids and is_recurring flags aligned with SERVICE_CDF.
+
+    Services are matched to their popularity weight by name, so the result
+    does not depend on the order the rows were inserted or returned in.
+    """
+    services = {
+        s.name: s for s in session.query(Service.id, Service.name, Service.is_recurring)
+    }
+    missing = [name for name in TELECOM_SERVICES if name not in services]
+    if missing:
+        raise ValueError(f"Services missing for purchase creation: {missing}")
+    service_ids = np.array(
+        [services[name].id for name in TELECOM_SERVICES], dtype=np.int64
+    )
+    service_is_recurring = np.array(
+        [services[name].is_recurring for name in TELECOM_SERVICES], dtype=bool
+    )
+    return service_ids, service_is_recurring
+
+
 def process_purchase_batch(args):
     """Process a single batch of purchases - standalone function for multiprocessing."""
     (
         batch_start,
         batch_size,
         n_purchases,
-        customer_ids,
         service_ids,
         service_is_recurring,
-        service_popularity_weights,
+        service_cdf,
+        seed,
     ) = args
+    customer_ids = _SHARED_ARRAYS["customer_ids"]
+    rng = np.random.default_rng(seed)
 
     batch_end = min(batch_start + batch_size, n_purchases)
     actual_batch_size = batch_end - batch_start
 
-    # Convert numpy arrays to regular lists for multiprocessing
-    customer_ids = list(customer_ids)
-    service_ids = list(service_ids)
-    service_is_recurring = list(service_is_recurring)
-    service_popularity_weights = list(service_popularity_weights)
-
     # Randomly select customer and service indices
-    customer_indices = np.random.choice(len(customer_ids), size=actual_batch_size)
-    service_indices = np.random.choice(
-        len(service_ids), size=actual_batch_size, p=service_popularity_weights
+    customer_indices = rng.integers(0, len(customer_ids), size=actual_batch_size)
+    service_indices = np.searchsorted(
+        service_cdf, rng.random(actual_batch_size), side="right"
     )
+    is_recurring = service_is_recurring[service_indices]
 
-    selected_customer_ids = [customer_ids[i] for i in customer_indices]
-    selected_service_ids = [service_ids[i] for i in service_indices]
-    selected_is_recurring = [service_is_recurring[i] for i in service_indices]
-
-    # Generate dates
-    start_dates = [
-        datetime.now() - timedelta(days=random.randint(1, 365))
-        for _ in range(actual_batch_size)
-    ]
-
-    end_dates = []
-    for i, is_recurring in enumerate(selected_is_recurring):
-        if is_recurring:
-            end_dates.append(start_dates[i] + timedelta(days=30))
-        else:
-            end_dates.append(None)
+    # Generate dates as Unix microseconds, whole days back from now
+    now_us = int(datetime.now().timestamp() * 1_000_000)
+    days_ago = rng.integers(1, 366, size=actual_batch_size, dtype=np.int64)
+    start_dates = now_us - days_ago * DAY_US
+    end_dates = start_dates + 30 * DAY_US
 
     # Generate statuses
-    statuses = np.random.choice(
-        [s.value for s in PurchaseStatus], size=actual_batch_size
-    )
+    statuses = PURCHASE_STATUS_VALUES[
+        rng.integers(0, len(PURCHASE_STATUS_VALUES), size=actual_batch_size)
+    ]
 
-    return [
+    return format_copy_columns(
+        PURCHASE_COLUMNS,
         {
-            "customer_id": int(selected_customer_ids[i]),
-            "service_id": int(selected_service_ids[i]),
-            "start_date": start_dates[i],
-            "end_date": end_dates[i],
-            "status": int(statuses[i]),
-        }
-        for i in range(actual_batch_size)
-    ]
+            "customer_id": customer_ids[customer_indices],
+            "service_id": service_ids[service_indices],
+            "start_date": start_dates,
+            "end_date": end_dates,
+            "status": statuses,
+        },
+        nulls={"end_date": ~is_recurring},
+    )
 
 
 def create_purchases_bulk(session, n_purchases=N_PURCHASES, batch_size=10000):
     """Create purchases using optimized bulk insert with batching and parallelism."""
     print(f"Creating {n_purchases} purchases with batching and parallelism...")
 
-    # Fetch customer IDs and service data in chunks
-    customer_ids = [c.id for c in session.query(Customer.id).yield_per(1000)]
-    service_query = session.query(Service.id, Service.is_recurring).yield_per(1000)
-    service_data = [(s.id, s.is_recurring) for s in service_query]
-    service_ids = [s[0] for s in service_data]
-    service_is_recurring = [s[1] for s in service_data]
+    # Fetch customer IDs straight into an array and services in SERVICE_CDF order
+    customer_ids = fetch_copy_columns(
+        session, "SELECT id::int8 FROM customers", {"id": "int8"}
+    )["id"]
+    service_ids, service_is_recurring = fetch_services_by_popularity(session)
 
-    if not customer_ids or not service_ids:
+    if not len(customer_ids) or not len(service_ids):
         raise ValueError("No customers or services available for purchase creation")
 
-    # Prepare arguments for parallel processing
+    # Prepare arguments for parallel processing, each batch with its own
+    # independent seed so no two workers draw the same values
     batch_starts = list(range(0, n_purchases, batch_size))
+    seeds = np.random.SeedSequence().spawn(len(batch_starts))
     process_args = [
         (
             batch_start,
             batch_size,
             n_purchases,
-            customer_ids,
             service_ids,
             service_is_recurring,
-            SERVICE_POPULARITY_WEIGHTS,
+            SERVICE_CDF,
+            seed,
         )
-        for batch_start in batch_starts
+        for batch_start, seed in zip(batch_starts, seeds)
     ]
 
-    # Parallelize purchase data generation
-    purchase_data = []
-    with ProcessPoolExecutor() as executor:
-        batches = executor.map(process_purchase_batch, process_args)
-        for i, batch in enumerate(batches):
-            purchase_data.extend(batch)
-            print(f"Generated {(i + 1) * batch_size:,} purchase records...")
-
-    # Use PostgreSQL COPY command for ultra-fast bulk insert
+    # Parallelize purchase data generation, dealing each encoded batch to
+    # the parallel COPY streams as soon as a worker finishes it
     print("Inserting purchases using PostgreSQL COPY command...")
-    for i in range(0, len(purchase_data), batch_size):
-        batch = purchase_data[i : i + batch_size]
-        insert_batch_copy(batch, session, "purchases")
-        print(f"Inserted {min((i + batch_size), n_purchases):,} purchases...")
-
-    print(f"Successfully created {len(purchase_data)} purchases.")
-    return purchase_data
+    with shared_arrays(customer_ids=customer_ids) as specs, ProcessPoolExecutor(
+        mp_context=WORKER_CONTEXT,
+        initializer=attach_shared_arrays,
+        initargs=(specs,),
+    ) as executor:
+        inserted = 0
+        with parallel_copy(
+            session.get_bind(), "purchases", PURCHASE_COLUMNS
+        ) as copy_batch:
+            for (batch_start, *_), data in generate_batches(
+                executor, process_purchase_batch, process_args
+            ):
+                copy_batch(data)
+                inserted += min(batch_size, n_purchases - batch_start)
+                print(f"Inserted {inserted:,} purchases...")
+
+    print(f"Successfully created {n_purchases} purchases.")
+    return n_purchases
 
 
 def process_payment_batch(args):
     """Process a single batch of payments - standalone function for multiprocessing."""
-    (
-        batch_start,
-        batch_size,
-        n_payments,
-        purchase_ids,
-        purchase_customer_ids,
-        service_base_prices,
-        customer_ids,
-    ) = args
+    batch_start, batch_size, n_payments, seed = args
+    purchase_ids = _SHARED_ARRAYS["purchase_ids"]
+    purchase_customer_ids = _SHARED_ARRAYS["purchase_customer_ids"]
+    service_base_prices = _SHARED_ARRAYS["service_base_prices"]
+    customer_ids = _SHARED_ARRAYS["customer_ids"]
+    rng = np.random.default_rng(seed)
 
     batch_end = min(batch_start + batch_size, n_payments)
     actual_batch_size = batch_end - batch_start
 
-    # Convert numpy arrays to regular lists for multiprocessing
-    purchase_ids = list(purchase_ids)
-    purchase_customer_ids = list(purchase_customer_ids)
-    service_base_prices = list(service_base_prices)
-    customer_ids = list(customer_ids)
-
     # Randomly select purchase indices
-    purchase_indices = np.random.choice(
-        len(purchase_ids), size=actual_batch_size, replace=True
+    purchase_indices = rng.integers(0, len(purchase_ids), size=actual_batch_size)
+
+    # Use the purchase's customer for 95% of payments and a random one for the rest
+    same_customer_mask = rng.random(actual_batch_size) < 0.95
+    other_customer_ids = customer_ids[
+        rng.integers(0, len(customer_ids), size=actual_batch_size)
+    ]
+    payment_customer_ids = np.where(
+        same_customer_mask,
+        purchase_customer_ids[purchase_indices],
+        other_customer_ids,
     )
-    selected_purchase_ids = [purchase_ids[i] for i in purchase_indices]
-    selected_customer_ids = [purchase_customer_ids[i] for i in purchase_indices]
-    selected_base_prices = [service_base_prices[i] for i in purchase_indices]
-
-    # Decide whether to use same customer (95%) or different customer (5%)
-    same_customer_mask = np.random.random(actual_batch_size) < 0.95
-    payment_customer_ids = []
-    for i, same_customer in enumerate(same_customer_mask):
-        if same_customer:
-            payment_customer_ids.append(selected_customer_ids[i])
-        else:
-            payment_customer_ids.append(random.choice(customer_ids))
 
     # Generate other fields
-    timestamps = [
-        datetime.now() - timedelta(days=random.randint(1, 365))
-        for _ in range(actual_batch_size)
+    now_us = int(datetime.now().timestamp() * 1_000_000)
+    days_ago = rng.integers(1, 366, size=actual_batch_size, dtype=np.int64)
+    timestamps = now_us - days_ago * DAY_US
+    currencies = CURRENCY_VALUES[
+        rng.integers(0, len(CURRENCY_VALUES), size=actual_batch_size)
+    ]
+    payment_methods = PAYMENT_METHOD_VALUES[
+        rng.integers(0, len(PAYMENT_METHOD_VALUES), size=actual_batch_size)
+    ]
+    statuses = PAYMENT_STATUS_VALUES[
+        rng.integers(0, len(PAYMENT_STATUS_VALUES), size=actual_batch_size)
     ]
-    currencies = np.random.choice([c.value for c in Currency], size=actual_batch_size)
-    payment_methods = np.random.choice(
-        [m.value for m in PaymentMethod], size=actual_batch_size
-    )
-    statuses = np.random.choice(
-        [s.value for s in PaymentStatus], size=actual_batch_size
-    )
 
-    return [
+    return format_copy_columns(
+        PAYMENT_COLUMNS,
         {
-            "customer_id": int(payment_customer_ids[i]),
-            "purchase_id": int(selected_purchase_ids[i]),
-            "amount": float(selected_base_prices[i]),
-            "currency": int(currencies[i]),
-            "payment_method": int(payment_methods[i]),
-            "status": int(statuses[i]),
-            "timestamp": timestamps[i],
-        }
-        for i in range(actual_batch_size)
-    ]
+            "customer_id": payment_customer_ids,
+            "purchase_id": purchase_ids[purchase_indices],
+            "amount": service_base_prices[purchase_indices],
+            "currency": currencies,
+            "payment_method": payment_methods,
+            "status": statuses,
+            "timestamp": timestamps,
+        },
+    )
 
 
 def create_payments_bulk(session, n_payments=N_PAYMENTS, batch_size=10000):
     """Create payments using optimized bulk insert with batching and parallelism."""
     print(f"Creating {n_payments} payments with batching and parallelism...")
 
-    # Fetch customer IDs and purchase-service pairs in chunks
-    customer_ids = [c.id for c in session.query(Customer.id).yield_per(1000)]
-    purchase_service_query = (
-        session.query(Purchase.id, Purchase.customer_id, Service.base_price)
-        .join(Service, Purchase.service_id == Service.id)
-        .yield_per(1000)
+    # Fetch customer IDs and purchase-service pairs straight into arrays
+    customer_ids = fetch_copy_columns(
+        session, "SELECT id::int8 FROM customers", {"id": "int8"}
+    )["id"]
+    purchase_service_data = fetch_copy_columns(
+        session,
+        "SELECT p.id::int8, p.customer_id::int8, s.base_price::float8"
+        " FROM purchases p JOIN services s ON s.id = p.service_id",
+        {"id": "int8", "customer_id": "int8", "base_price": "float8"},
     )
-    purchase_service_data = [
-        (p.id, p.customer_id, p.base_price) for p in purchase_service_query
-    ]
-    purchase_ids = [p[0] for p in purchase_service_data]
-    purchase_customer_ids = [p[1] for p in purchase_service_data]
-    service_base_prices = [p[2] for p in purchase_service_data]
+    purchase_ids = purchase_service_data["id"]
+    purchase_customer_ids = purchase_service_data["customer_id"]
+    service_base_prices = purchase_service_data["base_price"]
 
-    if not customer_ids or not purchase_ids:
+    if not len(customer_ids) or not len(purchase_ids):
         raise ValueError("No customers or purchases available for payment creation")
 
-    # Prepare arguments for parallel processing
+    # Prepare arguments for parallel processing, each batch with its own
+    # independent seed so no two workers draw the same values
     batch_starts = list(range(0, n_payments, batch_size))
+    seeds = np.random.SeedSequence().spawn(len(batch_starts))
     process_args = [
-        (
-            batch_start,
-            batch_size,
-            n_payments,
-            purchase_ids,
-            purchase_customer_ids,
-            service_base_prices,
-            customer_ids,
-        )
-        for batch_start in batch_starts
+        (batch_start, batch_size, n_payments, seed)
+        for batch_start, seed in zip(batch_starts, seeds)
     ]
 
-    # Parallelize payment data generation
-    payment_data = []
-    with ProcessPoolExecutor() as executor:
-        batches = executor.map(process_payment_batch, process_args)
-        for i, batch in enumerate(batches):
-            payment_data.extend(batch)
-            print(f"Generated {(i + 1) * batch_size:,} payment records...")
-
-    # Use PostgreSQL COPY command for ultra-fast bulk insert
+    # Parallelize payment data generation, dealing each encoded batch to
+    # the parallel COPY streams as soon as a worker finishes it
     print("Inserting payments using PostgreSQL COPY command...")
-    for i in range(0, len(payment_data), batch_size):
-        batch = payment_data[i : i + batch_size]
-        insert_batch_copy(batch, session, "payments")
-        print(f"Inserted {min((i + batch_size), n_payments):,} payments...")
+    with shared_arrays(
+        purchase_ids=purchase_ids,
+        purchase_customer_ids=purchase_customer_ids,
+        service_base_prices=service_base_prices,
+        customer_ids=customer_ids,
+    ) as specs, ProcessPoolExecutor(
+        mp_context=WORKER_CONTEXT,
+        initializer=attach_shared_arrays,
+        initargs=(specs,),
+    ) as executor:
+        inserted = 0
+        with parallel_copy(
+            session.get_bind(), "payments", PAYMENT_COLUMNS
+        ) as copy_batch:
+            for (batch_start, *_), data in generate_batches(
+                executor, process_payment_batch, process_args
+            ):
+                copy_batch(data)
+                inserted += min(batch_size, n_payments - batch_start)
+                print(f"Inserted {inserted:,} payments...")
+
+    print(f"Successfully created {n_payments} payments.")
+    return n_payments
+
+
+def create_purchases_server_side(session, n_purchases=N_PURCHASES):
+    """Create purchases in PostgreSQL, picking customers and popularity-weighted
+    services with the server's random()."""
+    print(f"Creating {n_purchases} purchases server-side...")
+
+    # width_bucket() counts the thresholds <= random(), i.e. the same inverse
+    # CDF lookup as searchsorted(side="right"), but 1-based for array indexing
+    service_ids = fetch_services_by_popularity(session)[0].tolist()
+    thresholds = [0.0] + SERVICE_CDF[:-1].tolist()
+    session.execute(text("SET LOCAL synchronous_commit = off"))
+    created = session.execute(
+        text(f"""
+            INSERT INTO purchases (customer_id, service_id, start_date, end_date, status)
+            SELECT p.customer_id, p.service_id, p.start_date,
+                   CASE WHEN s.is_recurring THEN p.start_date + interval '30 days' END,
+                   p.status
+            FROM (
+                SELECT c.ids[1 + floor(random() * cardinality(c.ids))::int] AS customer_id,
+                       CAST(:service_ids AS bigint[])[
+                           width_bucket(random(), CAST(:thresholds AS float8[]))
+                       ] AS service_id,
+                       now() - (1 + floor(random() * 365)) * interval '1 day' AS start_date,
+                       {random_choice_sql(PURCHASE_STATUS_VALUES.tolist())} AS status
+                FROM generate_series(1, :n_purchases),
+                     (SELECT array_agg(id) AS ids FROM customers) AS c
+            ) AS p
+            JOIN services AS s ON s.id = p.service_id
+            """),
+        {
+            "service_ids": service_ids,
+            "thresholds": thresholds,
+            "n_purchases": n_purchases,
+        },
+    ).rowcount
+    session.commit()
+
+    print(f"Successfully created {created} purchases.")
+    return created
+
+
+def create_payments_server_side(session, n_payments=N_PAYMENTS):
+    """Create payments in PostgreSQL with amounts matching service base prices."""
+    print(f"Creating {n_payments} payments server-side...")
+
+    # Like process_payment_batch, 5% of payments come from a random customer
+    session.execute(text("SET LOCAL synchronous_commit = off"))
+    created = session.execute(
+        text(f"""
+            INSERT INTO payments
+                (customer_id, purchase_id, amount, currency, payment_method, status, timestamp)
+            SELECT CASE WHEN x.same_customer THEN p.customer_id ELSE x.other_customer_id END,
+                   p.id, s.base_price, x.currency, x.payment_method, x.status, x.timestamp
+            FROM (
+                SELECT pu.ids[1 + floor(random() * cardinality(pu.ids))::int] AS purchase_id,
+                       random() < 0.95 AS same_customer,
+                       c.ids[1 + floor(random() * cardinality(c.ids))::int]
+                           AS other_customer_id,
+                       {random_choice_sql(CURRENCY_VALUES.tolist())} AS currency,
+                       {random_choice_sql(PAYMENT_METHOD_VALUES.tolist())} AS payment_method,
+                       {random_choice_sql(PAYMENT_STATUS_VALUES.tolist())} AS status,
+                       now() - (1 + floor(random() * 365)) * interval '1 day' AS timestamp
+                FROM generate_series(1, :n_payments),
+                     (SELECT array_agg(id) AS ids FROM purchases) AS pu,
+                     (SELECT array_agg(id) AS ids FROM customers) AS c
+            ) AS x
+            JOIN purchases AS p ON p.id = x.purchase_id
+            JOIN services AS s ON s.id = p.service_id
+            """),
+        {"n_payments": n_payments},
+    ).rowcount
+    session.commit()
 
-    print(f"Successfully created {len(payment_data)} payments.")
-    return payment_data
+    print(f"Successfully created {created} payments.")
+    return created
 
 
 def print_statistics(session):
@@ -535,12 +951,16 @@ def print_statistics(session):
     # Service popularity statistics
     print("\nService Popularity Statistics:")
     print("-" * 50)
-    services = session.query(Service).all()
-    total_purchases = session.query(Purchase).count()
+    # One GROUP BY query for all per-service counts
+    purchase_counts = dict(
+        session.query(Purchase.service_id, func.count())
+        .group_by(Purchase.service_id)
+        .all()
+    )
+    total_purchases = sum(purchase_counts.values())
+    services = session.query(Service.id, Service.name).all()
     for service in services:
-        purchase_count = (
-            session.query(Purchase).filter(Purchase.service_id == service.id).count()
-        )
+        purchase_count = purchase_counts.get(service.id, 0)
         popularity_percentage = (
             (purchase_count / total_purchases) * 100 if total_purchases > 0 else 0
         )
@@ -551,25 +971,23 @@ def print_statistics(session):
     # Payment verification
     print("\nPayment Verification:")
     print("-" * 50)
-    total_payments = session.query(Payment).count()
-    correct_amounts = 0
-    matching_customers = 0
-
-    # Sample verification (check first 1000 payments for performance)
-    sample_payments = session.query(Payment).limit(1000).all()
-    for payment in sample_payments:
-        # Get purchase and service
-        purchase = (
-            session.query(Purchase).filter(Purchase.id == payment.purchase_id).first()
+    # Sample verification (check first 1000 payments for performance): fetch
+    # only the compared columns in one JOIN and compare them in NumPy
+    sample_payments = (
+        session.query(
+            Payment.amount,
+            Service.base_price,
+            Payment.customer_id,
+            Purchase.customer_id,
         )
-        if purchase:
-            service = (
-                session.query(Service).filter(Service.id == purchase.service_id).first()
-            )
-            if service and abs(payment.amount - service.base_price) < 0.01:
-                correct_amounts += 1
-            if payment.customer_id == purchase.customer_id:
-                matching_customers += 1
+        .join(Purchase, Payment.purchase_id == Purchase.id)
+        .join(Service, Purchase.service_id == Service.id)
+        .limit(1000)
+        .all()
+    )
+    sample = np.array(sample_payments, dtype=np.float64).reshape(-1, 4)
+    correct_amounts = int((np.abs(sample[:, 0] - sample[:, 1]) < 0.01).sum())
+    matching_customers = int((sample[:, 2] == sample[:, 3]).sum())
 
     sample_size = len(sample_payments)
     amount_accuracy = (correct_amounts / sample_size) * 100 if sample_size > 0 else 0
@@ -588,6 +1006,27 @@ def print_statistics(session):
 
 def main():
     """Main function to populate the database using SQLAlchemy."""
+    parser = argparse.ArgumentParser(
+        description="Populate the payments database using SQLAlchemy and COPY."
+    )
+    parser.add_argument(
+        "--server-side",
+        action="store_true",
+        help="generate purchases and payments in SQL with generate_series "
+        "instead of NumPy workers and COPY",
+    )
+    parser.add_argument(
+        "--purchases",
+        action="store_true",
+        help="create purchases before the payments",
+    )
+    args = parser.parse_args()
+    server_side = args.server_side
+
+    # Tables this run loads; only these go without indexes, foreign keys or
+    # WAL, since each SET UNLOGGED/LOGGED rewrites the whole table
+    bulk_load_tables = ("purchases", "payments") if args.purchases else ("payments",)
+
     start_time = datetime.now()
     print("Starting high-performance database population with SQLAlchemy...")
     print("=" * 60)
@@ -599,14 +1038,50 @@ def main():
         # Get SQLAlchemy session
         session = get_session()
 
-        # Clear existing data
-        # clear_database(session)
-
-        # Create data using bulk operations
-        # customers_data = create_customers_bulk(session)
-        # services_data = create_custom_services_bulk(session)
-        # purchases_data = create_purchases_bulk(session)
-        payments_data = create_payments_bulk(session)
+        # Load the tables without per-row index, FK and WAL overhead; each
+        # drop is committed (so the parallel COPY connections see it) and
+        # recorded before the next, so a failure part way still restores
+        # everything already dropped
+        index_definitions, foreign_keys = [], []
+        try:
+            print(
+                f"Dropping indexes and foreign keys on {', '.join(bulk_load_tables)}..."
+            )
+            for table_name in bulk_load_tables:
+                indexes, table_foreign_keys = drop_indexes_and_foreign_keys(
+                    session, table_name
+                )
+                session.commit()
+                index_definitions += indexes
+                foreign_keys += table_foreign_keys
+            set_tables_logged(session, bulk_load_tables, False)
+            session.commit()
+
+            # Clear existing data
+            # clear_database(session)
+
+            # Create data using bulk operations
+            # customers_data = create_customers_bulk(session)
+            # services_data = create_custom_services_bulk(session)
+            if server_side:
+                if args.purchases:
+                    purchases_data = create_purchases_server_side(session)
+                payments_data = create_payments_server_side(session)
+            else:
+                if args.purchases:
+                    purchases_data = create_purchases_bulk(session)
+                payments_data = create_payments_bulk(session)
+        finally:
+            # Always put the tables back, even after a failed load
+            print(
+                f"Restoring indexes and foreign keys on {', '.join(bulk_load_tables)}..."
+            )
+            session.rollback()
+            set_tables_logged(session, bulk_load_tables, True)
+            session.commit()
+            restore_indexes_and_foreign_keys(
+                session.get_bind(), index_definitions, foreign_keys
+            )
 
         # Calculate end time and elapsed time
         end_time = datetime.now()
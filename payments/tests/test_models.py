@@ -1,9 +1,13 @@
 import pytest
+from datetime import timedelta
+from django.utils import timezone
+from payments import factories
 from payments.factories import (
     CustomerFactory,
     ServiceFactory,
     PurchaseFactory,
     PaymentFactory,
+    copy_rows,
     generate_bulk_data,
 )
 from payments.models import (
@@ -15,6 +19,9 @@ from payments.models import (
     ServiceType,
     BillingCycle,
     PurchaseStatus,
+    PaymentStatus,
+    PaymentMethod,
+    Currency,
 )
 
 
@@ -39,6 +46,56 @@ def test_bulk_data_population():
     assert Payment.objects.count() == 20
 
 
+@pytest.mark.django_db
+def test_bulk_data_population_with_copy(monkeypatch):
+    # Force the COPY path that normally only runs for large payment counts
+    monkeypatch.setattr(factories, "COPY_THRESHOLD", 0)
+
+    generate_bulk_data(n_customers=5, n_services=3, n_purchases=10, n_payments=20)
+    assert Payment.objects.count() == 20
+
+    customer_ids = set(Customer.objects.values_list("id", flat=True))
+    purchase_ids = set(Purchase.objects.values_list("id", flat=True))
+    now = timezone.now()
+    for payment in Payment.objects.all():
+        assert payment.customer_id in customer_ids
+        assert payment.purchase_id in purchase_ids
+        assert 10 <= payment.amount <= 200
+        assert payment.status in [e.value for e in PaymentStatus]
+        assert payment.payment_method in [e.value for e in PaymentMethod]
+        assert payment.currency in [e.value for e in Currency]
+        assert now - timedelta(days=365) < payment.timestamp < now
+
+
+@pytest.mark.django_db
+def test_copy_rows_values():
+    customer = CustomerFactory()
+    service = ServiceFactory()
+    start_date = timezone.now().replace(microsecond=123456)
+
+    copy_rows(
+        Purchase,
+        {
+            "customer_id": [customer.id, customer.id],
+            "service_id": [service.id, service.id],
+            "start_date": [start_date, start_date],
+            "end_date": [start_date + timedelta(days=30), None],
+            "status": [PurchaseStatus.ACTIVE.value, PurchaseStatus.EXPIRED.value],
+        },
+    )
+
+    purchases = list(Purchase.objects.order_by("id"))
+    assert len(purchases) == 2
+    assert purchases[0].customer == customer
+    assert purchases[0].service == service
+    assert purchases[0].start_date == start_date
+    assert purchases[0].end_date == start_date + timedelta(days=30)
+    assert purchases[0].status == PurchaseStatus.ACTIVE
+    # An empty CSV field loads as NULL
+    assert purchases[1].end_date is None
+    assert purchases[1].status == PurchaseStatus.EXPIRED
+
+
 @pytest.mark.django_db
 def test_payment_amount():
     payment = PaymentFactory(amount=150.0)
@@ -19,13 +19,7 @@ django.setup()
 
 from payments.models import Payment, Service, ServiceType, PaymentStatus, PaymentMethod
 from payments.db import get_session, close_session
-from payments.sqlalchemy_models import (
-    Payment as SAPayment,
-    Service as SAService,
-    Purchase as SAPurchase,
-    Customer as SACustomer,
-)
-from sqlalchemy import func, case
+from payments.queries import SERVICE_STATS_STMT, TOP_CUSTOMERS_STMT
 
 
 def test_django_orm():
@@ -52,19 +46,7 @@ def test_sqlalchemy():
     session = get_session()
     try:
         # Test service statistics query
-        service_stats = (
-            session.query(
-                SAService.type,
-                func.count(SAPayment.id).label("total_payments"),
-                func.sum(SAPayment.amount).label("total_amount"),
-                func.avg(SAPayment.amount).label("avg_amount"),
-            )
-            .join(SAPurchase, SAPayment.purchase_id == SAPurchase.id)
-            .join(SAService, SAPurchase.service_id == SAService.id)
-            .group_by(SAService.type)
-            .limit(3)
-            .all()
-        )
+        service_stats = session.execute(SERVICE_STATS_STMT.limit(3)).all()
 
         print(f"Found {len(service_stats)} service type statistics:")
         for stat in service_stats:
@@ -73,18 +55,7 @@ def test_sqlalchemy():
             )
 
         # Test top customers query
-        top_customers = (
-            session.query(
-                SACustomer.name,
-                func.sum(SAPayment.amount).label("total_spent"),
-                func.count(SAPayment.id).label("payment_count"),
-            )
-            .join(SACustomer, SAPayment.customer_id == SACustomer.id)
-            .group_by(SACustomer.name)
-            .order_by(func.sum(SAPayment.amount).desc())
-            .limit(3)
-            .all()
-        )
+        top_customers = session.execute(TOP_CUSTOMERS_STMT.limit(3)).all()
 
         print(f"Found {len(top_customers)} top customers:")
         for customer in top_customers:
@@ -0,0 +1,159 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Avg, Count, F, Q, Sum
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
+
+from payments import db, views
+from payments.factories import PaymentFactory, generate_bulk_data
+from payments.middleware import ScopedSessionMiddleware
+from payments.models import Payment, PaymentMethod, PaymentStatus
+from payments.views import get_dashboard_stats
+
+
+@pytest.fixture
+def sa_test_db(transactional_db):
+    """Point the scoped SQLAlchemy session at the Django test database.
+
+    The SQLAlchemy engine reads its own configuration, so without this it
+    would query the development database; the data is committed
+    (transactional_db) so the separate connection can see it.
+    """
+    settings = connection.settings_dict
+    engine = create_engine(
+        URL.create(
+            "postgresql",
+            username=settings["USER"],
+            password=settings["PASSWORD"],
+            host=settings["HOST"],
+            port=settings["PORT"],
+            database=settings["NAME"],
+        )
+    )
+    db.ScopedSession.remove()
+    db.ScopedSession.configure(bind=engine)
+    yield
+    db.ScopedSession.remove()
+    db.ScopedSession.configure(bind=db.engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def stats_calls(monkeypatch):
+    """Count get_dashboard_stats calls made by the view, starting from an
+    empty cache."""
+    cache.clear()
+    calls = []
+
+    def counting_get_dashboard_stats():
+        calls.append(None)
+        return get_dashboard_stats()
+
+    monkeypatch.setattr(views, "get_dashboard_stats", counting_get_dashboard_stats)
+    yield calls
+    cache.clear()
+
+
+def test_get_dashboard_stats(sa_test_db):
+    generate_bulk_data(n_customers=8, n_services=4, n_purchases=20, n_payments=60)
+
+    service_stats, top_customers = get_dashboard_stats()
+
+    expected_service_stats = (
+        Payment.objects.values(type=F("purchase__service__type"))
+        .annotate(
+            total_payments=Count("id"),
+            total_amount=Sum("amount"),
+            avg_amount=Avg("amount"),
+            successful_payments=Count(
+                "id", filter=Q(status=PaymentStatus.COMPLETED.value)
+            ),
+            credit_card_payments=Count(
+                "id", filter=Q(payment_method=PaymentMethod.CREDIT_CARD.value)
+            ),
+            bank_transfer_payments=Count(
+                "id", filter=Q(payment_method=PaymentMethod.BANK_TRANSFER.value)
+            ),
+            mobile_payments=Count(
+                "id", filter=Q(payment_method=PaymentMethod.MOBILE_PAYMENT.value)
+            ),
+        )
+        .order_by("type")
+    )
+    assert sorted(service_stats, key=lambda stat: stat["type"]) == [
+        pytest.approx(stat) for stat in expected_service_stats
+    ]
+
+    expected_top_customers = (
+        Payment.objects.values(name=F("customer__name"))
+        .annotate(
+            total_spent=Sum("amount"),
+            payment_count=Count("id"),
+            avg_payment=Avg("amount"),
+        )
+        .order_by("-total_spent")[:5]
+    )
+    assert [customer["name"] for customer in top_customers] == [
+        customer["name"] for customer in expected_top_customers
+    ]
+    for customer, expected in zip(top_customers, expected_top_customers):
+        assert customer["total_spent"] == pytest.approx(expected["total_spent"])
+        assert customer["payment_count"] == expected["payment_count"]
+        assert customer["avg_payment"] == pytest.approx(expected["avg_payment"])
+
+
+def test_dashboard_caches_stats_until_new_payment(sa_test_db, stats_calls, client):
+    generate_bulk_data(n_customers=5, n_services=3, n_purchases=10, n_payments=20)
+    url = reverse("payments:dashboard")
+
+    assert client.get(url).status_code == 200
+    assert len(stats_calls) == 1
+
+    # No new payment: the cached aggregates are reused
+    assert client.get(url).status_code == 200
+    assert len(stats_calls) == 1
+
+    # A new payment moves the latest id and with it the cache key
+    PaymentFactory()
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(stats_calls) == 2
+    assert len(response.context["recent_payments"]) == 5
+
+
+def test_dashboard_renders_without_payments(sa_test_db, stats_calls, client):
+    response = client.get(reverse("payments:dashboard"))
+
+    assert response.status_code == 200
+    assert len(stats_calls) == 1
+    assert response.context["service_stats"] == []
+    assert response.context["top_customers"] == []
+    assert b"No recent payments found" in response.content
+
+
+def test_scoped_session_removed_after_response():
+    def get_response(request):
+        db.ScopedSession()
+        return HttpResponse()
+
+    middleware = ScopedSessionMiddleware(get_response)
+    response = middleware(RequestFactory().get("/"))
+
+    assert response.status_code == 200
+    assert not db.ScopedSession.registry.has()
+
+
+def test_scoped_session_removed_after_exception():
+    def get_response(request):
+        db.ScopedSession()
+        raise RuntimeError("view failed")
+
+    middleware = ScopedSessionMiddleware(get_response)
+    with pytest.raises(RuntimeError):
+        middleware(RequestFactory().get("/"))
+
+    assert not db.ScopedSession.registry.has()